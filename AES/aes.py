@@ -1,4 +1,6 @@
-from typing import List
+from typing import List, Optional
+
+from aes_backend import block_cipher
 
 # AES S-box
 s_box = [
@@ -25,6 +27,9 @@ r_con = [
     0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36
 ]
 
+# Обратный S-box (строится один раз при импорте)
+inv_s_box = [s_box.index(x) for x in range(256)]
+
 def inv_sub_bytes(state: List[List[int]]) -> None:
     """
     Обратная замена байтов с помощью обратного S-box.
@@ -32,9 +37,6 @@ def inv_sub_bytes(state: List[List[int]]) -> None:
     Args:
         state: Матрица состояния 4x4 (модифицируется на месте)
     """
-    inv_s_box = [0] * 256
-    for i in range(256):
-        inv_s_box[s_box[i]] = i
     for r in range(4):
         for c in range(4):
             state[r][c] = inv_s_box[state[r][c]]
@@ -61,16 +63,18 @@ def inv_mix_columns(state: List[List[int]]) -> None:
     """
     for c in range(4):
         a = [state[r][c] for r in range(4)]
-        state[0][c] = gmul(0x0e, a[0]) ^ gmul(0x0b, a[1]) ^ gmul(0x0d, a[2]) ^ gmul(0x09, a[3])
-        state[1][c] = gmul(0x09, a[0]) ^ gmul(0x0e, a[1]) ^ gmul(0x0b, a[2]) ^ gmul(0x0d, a[3])
-        state[2][c] = gmul(0x0d, a[0]) ^ gmul(0x09, a[1]) ^ gmul(0x0e, a[2]) ^ gmul(0x0b, a[3])
-        state[3][c] = gmul(0x0b, a[0]) ^ gmul(0x0d, a[1]) ^ gmul(0x09, a[2]) ^ gmul(0x0e, a[3])
+        state[0][c] = mul_0e[a[0]] ^ mul_0b[a[1]] ^ mul_0d[a[2]] ^ mul_09[a[3]]
+        state[1][c] = mul_09[a[0]] ^ mul_0e[a[1]] ^ mul_0b[a[2]] ^ mul_0d[a[3]]
+        state[2][c] = mul_0d[a[0]] ^ mul_09[a[1]] ^ mul_0e[a[2]] ^ mul_0b[a[3]]
+        state[3][c] = mul_0b[a[0]] ^ mul_0d[a[1]] ^ mul_09[a[2]] ^ mul_0e[a[3]]
 
 
 def aes_decrypt_block(ciphertext: bytes, key: bytes) -> bytes:
     """
     Расшифровывает один блок 16 байт с помощью AES-128.
 
+    Тонкая обёртка над decrypt_block текущего бэкенда (см. aes_backend).
+
     Args:
         ciphertext: Зашифрованный блок 16 байт.
         key: Ключ шифрования 16 байт.
@@ -83,22 +87,7 @@ def aes_decrypt_block(ciphertext: bytes, key: bytes) -> bytes:
     if len(key) != 16:
         raise ValueError("Длина ключа должна быть 16 байт.")
 
-    state = bytes_to_state(ciphertext)
-    expanded_key = key_expansion(key)
-
-    add_round_key(state, expanded_key[40:44])  # Начальный раунд (последний ключ)
-
-    for round_num in range(9, 0, -1):
-        inv_shift_rows(state)
-        inv_sub_bytes(state)
-        add_round_key(state, expanded_key[round_num * 4:(round_num + 1) * 4])
-        inv_mix_columns(state)
-
-    inv_shift_rows(state)
-    inv_sub_bytes(state)
-    add_round_key(state, expanded_key[:4])  # Финальный раунд
-
-    return state_to_bytes(state)
+    return block_cipher(key).decrypt_block(ciphertext)
 
 
 def gmul(a: int, b: int) -> int:
@@ -132,6 +121,13 @@ def gmul(a: int, b: int) -> int:
     return p
 
 
+# Таблицы умножения на коэффициенты InvMixColumns (строятся один раз при импорте)
+mul_09 = [gmul(0x09, x) for x in range(256)]
+mul_0b = [gmul(0x0b, x) for x in range(256)]
+mul_0d = [gmul(0x0d, x) for x in range(256)]
+mul_0e = [gmul(0x0e, x) for x in range(256)]
+
+
 def key_expansion(key: bytes) -> List[List[int]]:
     """
     Расширяет 128-битный ключ в набор раундовых ключей.
@@ -277,7 +273,7 @@ def bytes_to_state(block: bytes) -> List[List[int]]:
     Returns:
         Матрица состояния 4x4 (список из 4 списков по 4 элемента)
     """
-    return [list(block[i:i + 4]) for i in range(0, 16, 4)]
+    return [[block[r + 4 * c] for c in range(4)] for r in range(4)]
 
 
 def state_to_bytes(state: List[List[int]]) -> bytes:
@@ -293,7 +289,7 @@ def state_to_bytes(state: List[List[int]]) -> bytes:
     Returns:
         Блок данных длиной 16 байт
     """
-    return bytes(sum(state, []))
+    return bytes(state[r][c] for c in range(4) for r in range(4))
 
 
 def aes_encrypt_block(plaintext: bytes, key: bytes) -> bytes:
@@ -305,6 +301,10 @@ def aes_encrypt_block(plaintext: bytes, key: bytes) -> bytes:
     2. 9 основных раундов (SubBytes → ShiftRows → MixColumns → AddRoundKey)
     3. Финальный раунд без MixColumns (SubBytes → ShiftRows → AddRoundKey)
     
+    Тонкая обёртка над encrypt_block текущего бэкенда (см. aes_backend):
+    ключ расширяется при каждом вызове, поэтому для многих блоков одним
+    ключом удобнее контекст AES.
+    
     Args:
         plaintext: Открытый текст длиной ровно 16 байт
         key: Ключ шифрования длиной ровно 16 байт
@@ -326,30 +326,395 @@ def aes_encrypt_block(plaintext: bytes, key: bytes) -> bytes:
         raise ValueError("Длина открытого текста должна быть 16 байт.")
     if len(key) != 16:
         raise ValueError("Длина ключа должна быть 16 байт.")
+
+    return block_cipher(key).encrypt_block(plaintext)
+
+
+# T-табличная реализация раунда
+
+def _rotr8(word: int) -> int:
+    """Циклический сдвиг 32-битного слова вправо на 8 бит."""
+    return ((word >> 8) | (word << 24)) & 0xFFFFFFFF
+
+
+def build_t_tables() -> tuple[List[int], List[int], List[int], List[int]]:
+    """
+    Строит четыре T-таблицы по 256 32-битных слов из S-box.
     
-    # Преобразуем входные данные в матрицу состояния
-    state = bytes_to_state(plaintext)
+    Каждая таблица объединяет SubBytes и MixColumns для байта из одной строки:
+    te0[x] = (02·S[x], S[x], S[x], 03·S[x]), а te1..te3 — это te0, циклически
+    сдвинутая вправо на 8, 16 и 24 бита. ShiftRows учитывается выбором столбца,
+    из которого берётся байт.
     
-    # Расширяем ключ для всех раундов
-    expanded_key = key_expansion(key)
+    Returns:
+        Кортеж из четырёх таблиц (te0, te1, te2, te3)
+    """
+    te0 = []
+    for x in range(256):
+        s = s_box[x]
+        te0.append((gmul(0x02, s) << 24) | (s << 16) | (s << 8) | gmul(0x03, s))
+    te1 = [_rotr8(word) for word in te0]
+    te2 = [_rotr8(word) for word in te1]
+    te3 = [_rotr8(word) for word in te2]
+    return te0, te1, te2, te3
 
-    # Начальный раунд: только добавление ключа
-    add_round_key(state, expanded_key[:4])
 
-    # 9 основных раундов
-    for round_num in range(1, 10):
-        sub_bytes(state)
-        shift_rows(state)
-        mix_columns(state)
-        add_round_key(state, expanded_key[round_num * 4: (round_num + 1) * 4])
+te0, te1, te2, te3 = build_t_tables()
 
-    # Финальный (10-й) раунд без MixColumns
-    sub_bytes(state)
-    shift_rows(state)
-    add_round_key(state, expanded_key[40:44])
 
-    # Преобразуем состояние обратно в байты
-    return state_to_bytes(state)
+def build_inv_t_tables() -> tuple[List[int], List[int], List[int], List[int]]:
+    """
+    Строит четыре обратные T-таблицы для эквивалентного обратного шифра.
+    
+    td0[x] = (0e·S⁻¹[x], 09·S⁻¹[x], 0d·S⁻¹[x], 0b·S⁻¹[x]) объединяет InvSubBytes
+    и InvMixColumns, td1..td3 — циклические сдвиги td0 вправо на 8, 16 и 24 бита.
+    
+    Returns:
+        Кортеж из четырёх таблиц (td0, td1, td2, td3)
+    """
+    td0 = []
+    for x in range(256):
+        s = inv_s_box[x]
+        td0.append((mul_0e[s] << 24) | (mul_09[s] << 16) | (mul_0d[s] << 8) | mul_0b[s])
+    td1 = [_rotr8(word) for word in td0]
+    td2 = [_rotr8(word) for word in td1]
+    td3 = [_rotr8(word) for word in td2]
+    return td0, td1, td2, td3
+
+
+td0, td1, td2, td3 = build_inv_t_tables()
+
+
+def key_expansion_words(key: bytes) -> List[int]:
+    """
+    Расширяет ключ и упаковывает каждое слово раундового ключа в 32-битное число.
+    
+    Args:
+        key: Ключ шифрования длиной 16 байт
+    
+    Returns:
+        Список из 44 слов (старший байт — первый байт слова)
+    """
+    return [int.from_bytes(bytes(word), 'big') for word in key_expansion(key)]
+
+
+def encrypt_block_words(plaintext: bytes, ek: List[int]) -> bytes:
+    """
+    Шифрует блок T-табличным движком по готовому расширенному ключу.
+    
+    Состояние хранится как четыре 32-битных слова-столбца, поэтому каждый
+    основной раунд — это 16 обращений к таблицам и XOR с раундовым ключом.
+    
+    Args:
+        plaintext: Открытый текст длиной 16 байт
+        ek: Расширенный ключ из key_expansion_words
+    
+    Returns:
+        Зашифрованный блок данных длиной 16 байт
+    """
+    t0, t1, t2, t3 = te0, te1, te2, te3
+    s0 = int.from_bytes(plaintext[0:4], 'big') ^ ek[0]
+    s1 = int.from_bytes(plaintext[4:8], 'big') ^ ek[1]
+    s2 = int.from_bytes(plaintext[8:12], 'big') ^ ek[2]
+    s3 = int.from_bytes(plaintext[12:16], 'big') ^ ek[3]
+
+    for i in range(4, 40, 4):
+        s0, s1, s2, s3 = (
+            t0[s0 >> 24] ^ t1[(s1 >> 16) & 0xFF] ^ t2[(s2 >> 8) & 0xFF] ^ t3[s3 & 0xFF] ^ ek[i],
+            t0[s1 >> 24] ^ t1[(s2 >> 16) & 0xFF] ^ t2[(s3 >> 8) & 0xFF] ^ t3[s0 & 0xFF] ^ ek[i + 1],
+            t0[s2 >> 24] ^ t1[(s3 >> 16) & 0xFF] ^ t2[(s0 >> 8) & 0xFF] ^ t3[s1 & 0xFF] ^ ek[i + 2],
+            t0[s3 >> 24] ^ t1[(s0 >> 16) & 0xFF] ^ t2[(s1 >> 8) & 0xFF] ^ t3[s2 & 0xFF] ^ ek[i + 3],
+        )
+
+    # Финальный раунд без MixColumns: только S-box и ShiftRows
+    sb = s_box
+    return (
+        ((sb[s0 >> 24] << 24 | sb[(s1 >> 16) & 0xFF] << 16
+          | sb[(s2 >> 8) & 0xFF] << 8 | sb[s3 & 0xFF]) ^ ek[40]).to_bytes(4, 'big')
+        + ((sb[s1 >> 24] << 24 | sb[(s2 >> 16) & 0xFF] << 16
+            | sb[(s3 >> 8) & 0xFF] << 8 | sb[s0 & 0xFF]) ^ ek[41]).to_bytes(4, 'big')
+        + ((sb[s2 >> 24] << 24 | sb[(s3 >> 16) & 0xFF] << 16
+            | sb[(s0 >> 8) & 0xFF] << 8 | sb[s1 & 0xFF]) ^ ek[42]).to_bytes(4, 'big')
+        + ((sb[s3 >> 24] << 24 | sb[(s0 >> 16) & 0xFF] << 16
+            | sb[(s1 >> 8) & 0xFF] << 8 | sb[s2 & 0xFF]) ^ ek[43]).to_bytes(4, 'big')
+    )
+
+
+def inv_key_expansion_words(ek: List[int]) -> List[int]:
+    """
+    Строит расширенный ключ для эквивалентного обратного шифра (FIPS-197, 5.3.5).
+    
+    Раундовые ключи берутся в обратном порядке, а к ключам раундов 1..9
+    заранее применяется InvMixColumns. Благодаря этому при расшифровании
+    InvMixColumns выполняется вместе с InvSubBytes через таблицы td0..td3.
+    
+    Args:
+        ek: Расширенный ключ из key_expansion_words
+    
+    Returns:
+        Список из 44 слов для decrypt_block_words
+    """
+    sb = s_box
+    dk = ek[40:44]
+    for i in range(36, 0, -4):
+        for w in ek[i:i + 4]:
+            # td[S[x]] = InvMixColumns для одного байта x
+            dk.append(td0[sb[w >> 24]] ^ td1[sb[(w >> 16) & 0xFF]]
+                      ^ td2[sb[(w >> 8) & 0xFF]] ^ td3[sb[w & 0xFF]])
+    dk.extend(ek[0:4])
+    return dk
+
+
+def decrypt_block_words(ciphertext: bytes, dk: List[int]) -> bytes:
+    """
+    Расшифровывает блок эквивалентным обратным шифром по обратным T-таблицам.
+    
+    Порядок операций раунда совпадает с шифрованием, поэтому расшифрование
+    выполняется за те же 16 обращений к таблицам на раунд.
+    
+    Args:
+        ciphertext: Зашифрованный блок длиной 16 байт
+        dk: Расширенный ключ из inv_key_expansion_words
+    
+    Returns:
+        Расшифрованный блок данных длиной 16 байт
+    """
+    t0, t1, t2, t3 = td0, td1, td2, td3
+    s0 = int.from_bytes(ciphertext[0:4], 'big') ^ dk[0]
+    s1 = int.from_bytes(ciphertext[4:8], 'big') ^ dk[1]
+    s2 = int.from_bytes(ciphertext[8:12], 'big') ^ dk[2]
+    s3 = int.from_bytes(ciphertext[12:16], 'big') ^ dk[3]
+
+    for i in range(4, 40, 4):
+        s0, s1, s2, s3 = (
+            t0[s0 >> 24] ^ t1[(s3 >> 16) & 0xFF] ^ t2[(s2 >> 8) & 0xFF] ^ t3[s1 & 0xFF] ^ dk[i],
+            t0[s1 >> 24] ^ t1[(s0 >> 16) & 0xFF] ^ t2[(s3 >> 8) & 0xFF] ^ t3[s2 & 0xFF] ^ dk[i + 1],
+            t0[s2 >> 24] ^ t1[(s1 >> 16) & 0xFF] ^ t2[(s0 >> 8) & 0xFF] ^ t3[s3 & 0xFF] ^ dk[i + 2],
+            t0[s3 >> 24] ^ t1[(s2 >> 16) & 0xFF] ^ t2[(s1 >> 8) & 0xFF] ^ t3[s0 & 0xFF] ^ dk[i + 3],
+        )
+
+    # Финальный раунд без InvMixColumns: только обратный S-box и InvShiftRows
+    isb = inv_s_box
+    return (
+        ((isb[s0 >> 24] << 24 | isb[(s3 >> 16) & 0xFF] << 16
+          | isb[(s2 >> 8) & 0xFF] << 8 | isb[s1 & 0xFF]) ^ dk[40]).to_bytes(4, 'big')
+        + ((isb[s1 >> 24] << 24 | isb[(s0 >> 16) & 0xFF] << 16
+            | isb[(s3 >> 8) & 0xFF] << 8 | isb[s2 & 0xFF]) ^ dk[41]).to_bytes(4, 'big')
+        + ((isb[s2 >> 24] << 24 | isb[(s1 >> 16) & 0xFF] << 16
+            | isb[(s0 >> 8) & 0xFF] << 8 | isb[s3 & 0xFF]) ^ dk[42]).to_bytes(4, 'big')
+        + ((isb[s3 >> 24] << 24 | isb[(s2 >> 16) & 0xFF] << 16
+            | isb[(s1 >> 8) & 0xFF] << 8 | isb[s0 & 0xFF]) ^ dk[43]).to_bytes(4, 'big')
+    )
+
+
+def aes_encrypt_block_ttable(plaintext: bytes, key: bytes) -> bytes:
+    """
+    Шифрует один 16-байтовый блок AES-128 с помощью T-таблиц.
+    
+    Результат совпадает с aes_encrypt_block, но вместо gmul и операций над
+    матрицей 4x4 используются предвычисленные таблицы te0..te3.
+    
+    Args:
+        plaintext: Открытый текст длиной ровно 16 байт
+        key: Ключ шифрования длиной ровно 16 байт
+    
+    Returns:
+        Зашифрованный блок данных длиной 16 байт
+    
+    Raises:
+        ValueError: Если длина plaintext или key не равна 16 байтам
+    
+    Example:
+        >>> key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+        >>> plaintext = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+        >>> aes_encrypt_block_ttable(plaintext, key).hex()
+        '3925841d02dc09fbdc118597196a0b32'
+    """
+    if len(plaintext) != 16:
+        raise ValueError("Длина открытого текста должна быть 16 байт.")
+    if len(key) != 16:
+        raise ValueError("Длина ключа должна быть 16 байт.")
+
+    return encrypt_block_words(plaintext, key_expansion_words(key))
+
+
+
+# Контекст шифра
+
+class AES:
+    """
+    Контекст шифра AES-128 с однократно расширенным ключом.
+    
+    Расширение ключа выполняется один раз в конструкторе, поэтому при
+    шифровании большого сообщения одним ключом на каждый блок приходится
+    только сама раундовая функция. Обратный S-box и таблицы InvMixColumns
+    строятся один раз при импорте модуля.
+    
+    Example:
+        >>> cipher = AES(bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c'))
+        >>> cipher.encrypt_block(bytes.fromhex('3243f6a8885a308d313198a2e0370734')).hex()
+        '3925841d02dc09fbdc118597196a0b32'
+    """
+
+    block_size = 16
+
+    def __init__(self, key: bytes) -> None:
+        """
+        Args:
+            key: Ключ шифрования длиной 16 байт
+        
+        Raises:
+            ValueError: Если длина ключа не равна 16 байтам
+        """
+        if len(key) != 16:
+            raise ValueError("Длина ключа должна быть 16 байт.")
+        self.key = bytes(key)
+        self.expanded_key = key_expansion(self.key)
+        self.ek = [int.from_bytes(bytes(word), 'big') for word in self.expanded_key]
+        self._dk: Optional[List[int]] = None
+
+    @property
+    def dk(self) -> List[int]:
+        """Раундовые ключи обратного шифра (вычисляются при первом расшифровании)."""
+        if self._dk is None:
+            self._dk = inv_key_expansion_words(self.ek)
+        return self._dk
+
+    def encrypt_block(self, plaintext: bytes) -> bytes:
+        """
+        Шифрует один блок 16 байт (T-табличный движок).
+        
+        Args:
+            plaintext: Открытый текст длиной 16 байт
+        
+        Returns:
+            Зашифрованный блок 16 байт
+        """
+        if len(plaintext) != 16:
+            raise ValueError("Длина открытого текста должна быть 16 байт.")
+        return encrypt_block_words(plaintext, self.ek)
+
+    def decrypt_block(self, ciphertext: bytes) -> bytes:
+        """
+        Расшифровывает один блок 16 байт (эквивалентный обратный шифр).
+        
+        Args:
+            ciphertext: Зашифрованный блок длиной 16 байт
+        
+        Returns:
+            Расшифрованный блок 16 байт
+        """
+        if len(ciphertext) != 16:
+            raise ValueError("Длина зашифрованного текста должна быть 16 байт.")
+        return decrypt_block_words(ciphertext, self.dk)
+
+    def decrypt_block_reference(self, ciphertext: bytes) -> bytes:
+        """
+        Расшифровывает один блок эталонным пошаговым обратным шифром.
+        
+        Args:
+            ciphertext: Зашифрованный блок длиной 16 байт
+        
+        Returns:
+            Расшифрованный блок 16 байт
+        """
+        if len(ciphertext) != 16:
+            raise ValueError("Длина зашифрованного текста должна быть 16 байт.")
+
+        expanded_key = self.expanded_key
+        state = bytes_to_state(ciphertext)
+
+        add_round_key(state, expanded_key[40:44])  # Начальный раунд (последний ключ)
+
+        for round_num in range(9, 0, -1):
+            inv_shift_rows(state)
+            inv_sub_bytes(state)
+            add_round_key(state, expanded_key[round_num * 4:(round_num + 1) * 4])
+            inv_mix_columns(state)
+
+        inv_shift_rows(state)
+        inv_sub_bytes(state)
+        add_round_key(state, expanded_key[:4])  # Финальный раунд
+
+        return state_to_bytes(state)
+
+    def encrypt_block_reference(self, plaintext: bytes) -> bytes:
+        """
+        Шифрует один блок эталонным пошаговым алгоритмом.
+        
+        Выполняет SubBytes → ShiftRows → MixColumns → AddRoundKey над
+        матрицей 4x4 так, как описано в FIPS-197. Медленнее encrypt_block,
+        используется для обучения и сверки движков.
+        
+        Args:
+            plaintext: Открытый текст длиной 16 байт
+        
+        Returns:
+            Зашифрованный блок 16 байт
+        """
+        if len(plaintext) != 16:
+            raise ValueError("Длина открытого текста должна быть 16 байт.")
+
+        expanded_key = self.expanded_key
+
+        # Преобразуем входные данные в матрицу состояния
+        state = bytes_to_state(plaintext)
+
+        # Начальный раунд: только добавление ключа
+        add_round_key(state, expanded_key[:4])
+
+        # 9 основных раундов
+        for round_num in range(1, 10):
+            sub_bytes(state)
+            shift_rows(state)
+            mix_columns(state)
+            add_round_key(state, expanded_key[round_num * 4: (round_num + 1) * 4])
+
+        # Финальный (10-й) раунд без MixColumns
+        sub_bytes(state)
+        shift_rows(state)
+        add_round_key(state, expanded_key[40:44])
+
+        # Преобразуем состояние обратно в байты
+        return state_to_bytes(state)
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Шифрует последовательность блоков независимо друг от друга (ECB).
+        
+        Args:
+            data: Данные, длина которых кратна 16 байтам
+        
+        Returns:
+            Зашифрованные данные той же длины
+        
+        Raises:
+            ValueError: Если длина данных не кратна 16 байтам
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        view = memoryview(data)
+        ek = self.ek
+        return b"".join(encrypt_block_words(view[i:i + 16], ek) for i in range(0, len(view), 16))
+
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Расшифровывает последовательность блоков независимо друг от друга (ECB).
+        
+        Args:
+            data: Данные, длина которых кратна 16 байтам
+        
+        Returns:
+            Расшифрованные данные той же длины
+        
+        Raises:
+            ValueError: Если длина данных не кратна 16 байтам
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        view = memoryview(data)
+        dk = self.dk
+        return b"".join(decrypt_block_words(view[i:i + 16], dk) for i in range(0, len(view), 16))
 
 
 # Пример использования
@@ -361,9 +726,11 @@ if __name__ == '__main__':
     
     # Шифрование блока
     encrypted = aes_encrypt_block(example_plaintext, example_key)
+    encrypted_ttable = aes_encrypt_block_ttable(example_plaintext, example_key)
     decrypted = aes_decrypt_block(encrypted, example_key)
 
     print(f'Открытый текст: {example_plaintext.hex()}')
     print(f'Ключ:           {example_key.hex()}')
     print(f'Шифртекст:      {encrypted.hex()}')
     print(f'Расшифровка      {decrypted.hex()}')
+    print(f'T-таблицы:      {encrypted_ttable.hex()}')
@@ -0,0 +1,181 @@
+import os
+import warnings
+from typing import Optional
+
+# Переменная окружения для выбора бэкенда: auto (по умолчанию), python, pycryptodome
+BACKEND_ENV = 'AES_BACKEND'
+BACKENDS = ('auto', 'python', 'pycryptodome')
+
+# Тестовый вектор из спецификации FIPS-197
+SELF_TEST_KEY = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+SELF_TEST_PLAINTEXT = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+SELF_TEST_CIPHERTEXT = bytes.fromhex('3925841d02dc09fbdc118597196a0b32')
+
+
+# ===== Бэкенды =====
+
+class PythonBackend:
+    """Чистый Python: контекст AES из aes.py, режимы реализует aes_modes."""
+
+    name = 'python'
+
+    def __init__(self) -> None:
+        # aes импортирует этот модуль, поэтому класс контекста берётся при создании бэкенда
+        from aes import AES
+
+        self._aes = AES
+
+    def block_cipher(self, key: bytes):
+        """Блочный шифр (контекст aes.AES) с интерфейсом encrypt_block/decrypt_block."""
+        return self._aes(key)
+
+    def mode_cipher(self, key: bytes, mode: str, iv: bytes, decrypt: bool) -> None:
+        """Нативного режима нет — режим выполняется на Python."""
+        return None
+
+
+class NativeBlockCipher:
+    """Обёртка над Crypto.Cipher.AES в режиме ECB с интерфейсом контекста AES."""
+
+    block_size = 16
+
+    def __init__(self, key: bytes) -> None:
+        """
+        :param key: ключ шифрования 16 байт
+        """
+        from Crypto.Cipher import AES as CryptoAES
+
+        if len(key) != 16:
+            raise ValueError("Длина ключа должна быть 16 байт.")
+        self.key = bytes(key)
+        self._ecb = CryptoAES.new(self.key, CryptoAES.MODE_ECB)
+
+    def encrypt_block(self, plaintext: bytes) -> bytes:
+        """Шифрует один блок 16 байт."""
+        if len(plaintext) != 16:
+            raise ValueError("Длина открытого текста должна быть 16 байт.")
+        return self._ecb.encrypt(plaintext)
+
+    def decrypt_block(self, ciphertext: bytes) -> bytes:
+        """Расшифровывает один блок 16 байт."""
+        if len(ciphertext) != 16:
+            raise ValueError("Длина зашифрованного текста должна быть 16 байт.")
+        return self._ecb.decrypt(ciphertext)
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """Шифрует независимые блоки (ECB) одним нативным вызовом."""
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        return self._ecb.encrypt(data)
+
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """Расшифровывает независимые блоки (ECB) одним нативным вызовом."""
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        return self._ecb.decrypt(data)
+
+
+class PycryptodomeBackend:
+    """Нативный бэкенд на pycryptodome (зависимость проекта)."""
+
+    name = 'pycryptodome'
+
+    def __init__(self) -> None:
+        from Crypto.Cipher import AES as CryptoAES
+
+        self._aes = CryptoAES
+
+    def block_cipher(self, key: bytes) -> NativeBlockCipher:
+        """Блочный шифр с интерфейсом encrypt_block/decrypt_block."""
+        return NativeBlockCipher(key)
+
+    def mode_cipher(self, key: bytes, mode: str, iv: bytes, decrypt: bool):
+        """
+        Нативный объект режима с методами encrypt/decrypt для потоковой обработки.
+
+        Паддинг и буферизацию неполных блоков ECB/CBC выполняет aes_modes.
+        """
+        aes = self._aes
+        if mode == 'ECB':
+            return aes.new(key, aes.MODE_ECB)
+        if mode == 'CBC':
+            return aes.new(key, aes.MODE_CBC, iv=iv)
+        if mode == 'CFB':
+            return aes.new(key, aes.MODE_CFB, iv=iv, segment_size=128)
+        if mode == 'OFB':
+            return aes.new(key, aes.MODE_OFB, iv=iv)
+        return aes.new(key, aes.MODE_CTR, nonce=b"", initial_value=iv)
+
+
+# ===== Выбор бэкенда =====
+
+_backend = None
+
+
+def self_test(backend) -> bool:
+    """
+    Сверяет бэкенд с чистой реализацией на тестовом векторе FIPS-197.
+
+    :return: True, если шифрование и расшифрование совпадают
+    """
+    reference = PythonBackend().block_cipher(SELF_TEST_KEY)
+    cipher = backend.block_cipher(SELF_TEST_KEY)
+    encrypted = cipher.encrypt_block(SELF_TEST_PLAINTEXT)
+    return (encrypted == reference.encrypt_block(SELF_TEST_PLAINTEXT) == SELF_TEST_CIPHERTEXT
+            and cipher.decrypt_block(encrypted) == SELF_TEST_PLAINTEXT)
+
+
+def _select(name: str):
+    """Создаёт бэкенд по имени и проверяет его самотестом."""
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд {name!r}, ожидается один из {BACKENDS}.")
+    if name == 'python':
+        return PythonBackend()
+
+    try:
+        backend = PycryptodomeBackend()
+    except ImportError:
+        if name == 'pycryptodome':
+            raise
+        return PythonBackend()
+
+    if self_test(backend):
+        return backend
+    if name == 'pycryptodome':
+        raise RuntimeError("Бэкенд pycryptodome не прошёл самотест FIPS-197.")
+    warnings.warn("Бэкенд pycryptodome не прошёл самотест FIPS-197, используется чистый Python.")
+    return PythonBackend()
+
+
+def get_backend():
+    """
+    Возвращает текущий бэкенд, выбирая его при первом обращении.
+
+    По умолчанию используется pycryptodome, если он установлен и прошёл
+    самотест, иначе — чистый Python. AES_BACKEND=python принудительно
+    включает чистую реализацию (учебные и отладочные запуски).
+    """
+    global _backend
+    if _backend is None:
+        _backend = _select(os.environ.get(BACKEND_ENV, 'auto').lower())
+    return _backend
+
+
+def set_backend(name: Optional[str]) -> None:
+    """
+    Явно выбирает бэкенд.
+
+    :param name: один из BACKENDS; None — выбрать заново при следующем обращении
+    """
+    global _backend
+    _backend = None if name is None else _select(name.lower())
+
+
+def block_cipher(key: bytes):
+    """Блочный шифр текущего бэкенда для ключа key."""
+    return get_backend().block_cipher(key)
+
+
+if __name__ == '__main__':
+    print(f'Бэкенд: {get_backend().name}')
+    print(f'Шифртекст: {block_cipher(SELF_TEST_KEY).encrypt_block(SELF_TEST_PLAINTEXT).hex()}')
@@ -0,0 +1,419 @@
+from typing import Iterable, List, Sequence, Union
+
+import numpy as np
+
+from aes import gmul, inv_s_box, key_expansion, mul_09, mul_0b, mul_0d, mul_0e, r_con, s_box
+from aes_modes import pkcs7_pad, pkcs7_unpad
+
+BlocksLike = Union[bytes, bytearray, memoryview, np.ndarray]
+MAX_ROUNDS = 10
+
+# ===== Таблицы в виде массивов NumPy =====
+
+S_BOX = np.array(s_box, dtype=np.uint8)
+INV_S_BOX = np.array(inv_s_box, dtype=np.uint8)
+R_CON = np.array(r_con, dtype=np.uint8)
+XTIME = np.array([gmul(0x02, x) for x in range(256)], dtype=np.uint8)
+MUL_09 = np.array(mul_09, dtype=np.uint8)
+MUL_0B = np.array(mul_0b, dtype=np.uint8)
+MUL_0D = np.array(mul_0d, dtype=np.uint8)
+MUL_0E = np.array(mul_0e, dtype=np.uint8)
+
+# ShiftRows как перестановка 16 байт блока (байт i = строка i % 4, столбец i // 4)
+SHIFT_ROWS = np.array([r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)])
+INV_SHIFT_ROWS = np.argsort(SHIFT_ROWS)
+
+
+# ===== Преобразование данных =====
+
+def as_blocks(data: BlocksLike) -> np.ndarray:
+    """
+    Приводит данные к массиву блоков формы (N, 16) типа uint8.
+
+    :param data: массив (N, 16) uint8 или байты, длина которых кратна 16
+    :return: массив блоков (копия, исходные данные не изменяются)
+    :raises ValueError: если форма или тип массива либо длина данных некорректны
+    """
+    if isinstance(data, np.ndarray):
+        if data.ndim != 2 or data.shape[1] != 16:
+            raise ValueError("Массив блоков должен иметь форму (N, 16).")
+        if data.dtype != np.uint8:
+            raise ValueError(f"Массив блоков должен иметь тип uint8, а не {data.dtype}.")
+        return data.copy()
+    if len(data) % 16 != 0:
+        raise ValueError("Длина данных должна быть кратна 16 байтам.")
+    return np.frombuffer(bytes(data), dtype=np.uint8).reshape(-1, 16).copy()
+
+
+def round_keys(key: bytes) -> np.ndarray:
+    """
+    Расширяет ключ в массив раундовых ключей формы (11, 16).
+
+    Байты раундового ключа лежат в том же порядке, что и байты блока,
+    поэтому AddRoundKey — это XOR целых массивов.
+    """
+    return np.array(key_expansion(key), dtype=np.uint8).reshape(11, 16)
+
+
+# ===== Раундовые преобразования над всеми блоками сразу =====
+
+def _check_state(state: np.ndarray, rounds: int) -> None:
+    """Проверяет тип блоков и число раундов перед шифрованием массива."""
+    if not 1 <= rounds <= MAX_ROUNDS:
+        raise ValueError(f"Число раундов должно быть от 1 до {MAX_ROUNDS}.")
+    if state.dtype != np.uint8:
+        raise ValueError(f"Массив блоков должен иметь тип uint8, а не {state.dtype}.")
+
+
+def mix_columns(state: np.ndarray) -> np.ndarray:
+    """MixColumns для массива состояний (N, 16)."""
+    cols = state.reshape(-1, 4, 4)
+    a0, a1, a2, a3 = cols[:, :, 0], cols[:, :, 1], cols[:, :, 2], cols[:, :, 3]
+    total = a0 ^ a1 ^ a2 ^ a3
+    out = np.empty_like(cols)
+    out[:, :, 0] = a0 ^ total ^ XTIME[a0 ^ a1]
+    out[:, :, 1] = a1 ^ total ^ XTIME[a1 ^ a2]
+    out[:, :, 2] = a2 ^ total ^ XTIME[a2 ^ a3]
+    out[:, :, 3] = a3 ^ total ^ XTIME[a3 ^ a0]
+    return out.reshape(-1, 16)
+
+
+def inv_mix_columns(state: np.ndarray) -> np.ndarray:
+    """InvMixColumns для массива состояний (N, 16)."""
+    cols = state.reshape(-1, 4, 4)
+    a0, a1, a2, a3 = cols[:, :, 0], cols[:, :, 1], cols[:, :, 2], cols[:, :, 3]
+    out = np.empty_like(cols)
+    out[:, :, 0] = MUL_0E[a0] ^ MUL_0B[a1] ^ MUL_0D[a2] ^ MUL_09[a3]
+    out[:, :, 1] = MUL_09[a0] ^ MUL_0E[a1] ^ MUL_0B[a2] ^ MUL_0D[a3]
+    out[:, :, 2] = MUL_0D[a0] ^ MUL_09[a1] ^ MUL_0E[a2] ^ MUL_0B[a3]
+    out[:, :, 3] = MUL_0B[a0] ^ MUL_0D[a1] ^ MUL_09[a2] ^ MUL_0E[a3]
+    return out.reshape(-1, 16)
+
+
+def encrypt_array(state: np.ndarray, rk: np.ndarray, rounds: int = 10) -> np.ndarray:
+    """
+    Шифрует массив блоков (N, 16) по готовым раундовым ключам.
+
+    :param state: блоки открытого текста (N, 16), uint8
+    :param rk: раундовые ключи (11, 16) или (N, 11, 16) — по ключу на блок
+    :param rounds: число раундов (меньше 10 — ослабленный шифр для криптоанализа;
+                   последний раунд, как обычно, без MixColumns)
+    :return: блоки шифртекста (N, 16)
+    :raises ValueError: если rounds вне 1..10 или блоки не uint8
+    """
+    _check_state(state, rounds)
+    state = state ^ rk[..., 0, :]
+    for round_num in range(1, rounds):
+        state = mix_columns(S_BOX[state][:, SHIFT_ROWS]) ^ rk[..., round_num, :]
+    return S_BOX[state][:, SHIFT_ROWS] ^ rk[..., rounds, :]
+
+
+def decrypt_array(state: np.ndarray, rk: np.ndarray, rounds: int = 10) -> np.ndarray:
+    """
+    Расшифровывает массив блоков (N, 16) по готовым раундовым ключам.
+
+    :param state: блоки шифртекста (N, 16), uint8
+    :param rk: раундовые ключи (11, 16) или (N, 11, 16) — по ключу на блок
+    :param rounds: число раундов (см. encrypt_array)
+    :return: блоки открытого текста (N, 16)
+    :raises ValueError: если rounds вне 1..10 или блоки не uint8
+    """
+    _check_state(state, rounds)
+    state = state ^ rk[..., rounds, :]
+    for round_num in range(rounds - 1, 0, -1):
+        state = inv_mix_columns(INV_S_BOX[state[:, INV_SHIFT_ROWS]] ^ rk[..., round_num, :])
+    return INV_S_BOX[state[:, INV_SHIFT_ROWS]] ^ rk[..., 0, :]
+
+
+# ===== Публичный интерфейс =====
+
+def encrypt_blocks(blocks: BlocksLike, key: bytes, rounds: int = 10) -> Union[bytes, np.ndarray]:
+    """
+    Шифрует пачку независимых блоков (режим ECB) за один векторизованный проход.
+
+    Результат побитово совпадает с поблочным aes_encrypt_block.
+
+    :param blocks: массив (N, 16) uint8 или байты, длина которых кратна 16
+    :param key: ключ шифрования 16 байт
+    :param rounds: число раундов (1..10), см. encrypt_array
+    :return: шифртекст того же вида, что и вход (массив или bytes)
+    """
+    out = encrypt_array(as_blocks(blocks), round_keys(key), rounds)
+    return out if isinstance(blocks, np.ndarray) else out.tobytes()
+
+
+def decrypt_blocks(blocks: BlocksLike, key: bytes, rounds: int = 10) -> Union[bytes, np.ndarray]:
+    """
+    Расшифровывает пачку независимых блоков (режим ECB).
+
+    :param blocks: массив (N, 16) uint8 или байты, длина которых кратна 16
+    :param key: ключ шифрования 16 байт
+    :param rounds: число раундов (1..10), см. encrypt_array
+    :return: открытый текст того же вида, что и вход (массив или bytes)
+    """
+    out = decrypt_array(as_blocks(blocks), round_keys(key), rounds)
+    return out if isinstance(blocks, np.ndarray) else out.tobytes()
+
+
+def counter_blocks(counter: bytes, n_blocks: int) -> np.ndarray:
+    """
+    Строит N последовательных 128-битных счётчиков (big-endian) начиная с counter.
+
+    :param counter: начальный блок счётчика 16 байт
+    :param n_blocks: количество блоков
+    :return: массив (n_blocks, 16) uint8
+    """
+    if len(counter) != 16:
+        raise ValueError("Длина блока счётчика должна быть 16 байт.")
+    hi0 = np.uint64(int.from_bytes(counter[:8], 'big'))
+    lo0 = np.uint64(int.from_bytes(counter[8:], 'big'))
+    lo = lo0 + np.arange(n_blocks, dtype=np.uint64)  # переполнение по модулю 2^64
+    hi = hi0 + (lo < lo0).astype(np.uint64)
+    words = np.empty((n_blocks, 2), dtype='>u8')
+    words[:, 0] = hi
+    words[:, 1] = lo
+    return words.view(np.uint8).reshape(n_blocks, 16)
+
+
+def ctr_keystream(key: bytes, counter: bytes, n_blocks: int) -> np.ndarray:
+    """
+    Генерирует n_blocks блоков гаммы CTR одним векторизованным проходом.
+
+    :param key: ключ шифрования 16 байт
+    :param counter: начальный блок счётчика 16 байт
+    :param n_blocks: количество блоков гаммы
+    :return: массив (n_blocks, 16) uint8
+    """
+    return encrypt_array(counter_blocks(counter, n_blocks), round_keys(key))
+
+
+def ctr_crypt(data: bytes, key: bytes, counter: bytes, chunk_blocks: int = 65536) -> bytes:
+    """
+    Шифрует/расшифровывает данные произвольной длины в режиме CTR.
+
+    Гамма генерируется порциями по chunk_blocks блоков, чтобы ограничить
+    расход памяти на больших файлах.
+
+    :param data: входные данные
+    :param key: ключ шифрования 16 байт
+    :param counter: начальный блок счётчика 16 байт
+    :param chunk_blocks: размер порции в блоках
+    :return: результат XOR данных с гаммой
+    """
+    rk = round_keys(key)
+    src = np.frombuffer(bytes(data), dtype=np.uint8)
+    out = np.empty_like(src)
+    start = int.from_bytes(counter, 'big')
+    step = chunk_blocks * 16
+    for offset in range(0, len(src), step):
+        chunk = src[offset:offset + step]
+        n_blocks = (len(chunk) + 15) // 16
+        block_counter = ((start + offset // 16) % (1 << 128)).to_bytes(16, 'big')
+        stream = encrypt_array(counter_blocks(block_counter, n_blocks), rk).reshape(-1)
+        out[offset:offset + len(chunk)] = chunk ^ stream[:len(chunk)]
+    return out.tobytes()
+
+
+# ===== Много ключей за один проход =====
+
+def as_keys(keys: Union[BlocksLike, Iterable[bytes]]) -> np.ndarray:
+    """
+    Приводит набор ключей к массиву формы (N, 16) типа uint8.
+
+    :param keys: массив (N, 16), байты длиной 16 * N или последовательность ключей по 16 байт
+    :return: массив ключей
+    """
+    if isinstance(keys, (bytes, bytearray, memoryview, np.ndarray)):
+        return as_blocks(keys)
+    return as_blocks(b"".join(keys))
+
+
+def batch_key_expansion(keys: Union[BlocksLike, Iterable[bytes]]) -> np.ndarray:
+    """
+    Расширяет N ключей одновременно в компактный массив раундовых ключей.
+
+    Каждый шаг расписания (RotWord, SubWord, XOR с Rcon) выполняется сразу
+    для всех ключей, поэтому стоимость не растёт линейно в интерпретаторе.
+
+    :param keys: N ключей по 16 байт (см. as_keys)
+    :return: массив (N, 11, 16) uint8; rk[n] совпадает с round_keys(keys[n])
+    """
+    k = as_keys(keys)
+    words = np.empty((len(k), 44, 4), dtype=np.uint8)
+    words[:, :4] = k.reshape(-1, 4, 4)
+    for i in range(4, 44):
+        temp = words[:, i - 1]
+        if i % 4 == 0:
+            temp = S_BOX[np.roll(temp, -1, axis=1)]
+            temp[:, 0] ^= R_CON[i // 4 - 1]
+        words[:, i] = words[:, i - 4] ^ temp
+    return words.reshape(-1, 11, 16)
+
+
+def _per_key_blocks(blocks: BlocksLike, n_keys: int) -> np.ndarray:
+    """Блоки для пакетного шифрования: один блок на все ключи или по блоку на ключ."""
+    state = as_blocks(blocks)
+    if len(state) == 1:
+        return np.repeat(state, n_keys, axis=0)
+    if len(state) != n_keys:
+        raise ValueError("Количество блоков должно совпадать с количеством ключей.")
+    return state
+
+
+def encrypt_multi_key(blocks: BlocksLike, keys: Union[BlocksLike, Iterable[bytes]]) -> np.ndarray:
+    """
+    Шифрует по одному блоку каждым из N ключей за один векторизованный проход.
+
+    :param blocks: один блок 16 байт (для всех ключей) или N блоков
+    :param keys: N ключей по 16 байт
+    :return: массив шифртекстов (N, 16)
+    """
+    rk = batch_key_expansion(keys)
+    return encrypt_array(_per_key_blocks(blocks, len(rk)), rk)
+
+
+def decrypt_multi_key(blocks: BlocksLike, keys: Union[BlocksLike, Iterable[bytes]]) -> np.ndarray:
+    """
+    Расшифровывает по одному блоку каждым из N ключей за один проход.
+
+    :param blocks: один блок 16 байт (для всех ключей) или N блоков
+    :param keys: N ключей по 16 байт
+    :return: массив открытых текстов (N, 16)
+    """
+    rk = batch_key_expansion(keys)
+    return decrypt_array(_per_key_blocks(blocks, len(rk)), rk)
+
+
+def match_keys(plaintext: bytes, ciphertext: bytes, keys: Union[BlocksLike, Iterable[bytes]]) -> np.ndarray:
+    """
+    Проверка ключей-кандидатов по известной паре открытый текст/шифртекст.
+
+    :param plaintext: открытый текст 16 байт
+    :param ciphertext: шифртекст 16 байт
+    :param keys: N ключей-кандидатов
+    :return: индексы ключей, для которых E_k(plaintext) == ciphertext
+    """
+    encrypted = encrypt_multi_key(plaintext, keys)
+    expected = np.frombuffer(bytes(ciphertext), dtype=np.uint8)
+    return np.flatnonzero((encrypted == expected).all(axis=1))
+
+
+# ===== Несколько независимых цепочек CBC =====
+
+def _chain_keys(keys: Union[bytes, BlocksLike, Iterable[bytes]], n: int) -> np.ndarray:
+    """Раундовые ключи для N цепочек: (11, 16) для общего ключа или (N, 11, 16)."""
+    if isinstance(keys, (bytes, bytearray, memoryview)) and len(keys) == 16:
+        return round_keys(bytes(keys))
+    rk = batch_key_expansion(keys)
+    if len(rk) != n:
+        raise ValueError("Количество ключей должно совпадать с количеством сообщений.")
+    return rk
+
+
+def _message_blocks(messages: Sequence[bytes], pad: bool) -> tuple:
+    """Все блоки сообщений подряд, число блоков и смещение первого блока каждого сообщения."""
+    if pad:
+        messages = [pkcs7_pad(bytes(message)) for message in messages]
+    elif any(len(message) % 16 for message in messages):
+        raise ValueError("Длина данных должна быть кратна 16 байтам.")
+    lengths = np.array([len(message) // 16 for message in messages], dtype=np.intp)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.intp)
+    return as_blocks(b"".join(bytes(message) for message in messages)), lengths, starts
+
+
+def cbc_encrypt_many(messages: Sequence[bytes], keys: Union[bytes, BlocksLike, Iterable[bytes]],
+                     ivs: Union[BlocksLike, Iterable[bytes]], padding: bool = True) -> List[bytes]:
+    """
+    Шифрует N независимых сообщений в режиме CBC, продвигая все цепочки синхронно.
+
+    На шаге i блок i всех ещё не закончившихся сообщений шифруется одним
+    векторизованным вызовом encrypt_array. Сообщения упорядочены по убыванию
+    длины, поэтому активные цепочки всегда образуют префикс пачки, а
+    закончившиеся выбывают из неё. Шифртексты совпадают с обычным CBC.
+
+    :param messages: N открытых текстов
+    :param keys: общий ключ 16 байт или N ключей
+    :param ivs: N векторов инициализации по 16 байт
+    :param padding: дополнять ли сообщения по PKCS#7 (иначе длины кратны 16)
+    :return: список шифртекстов в порядке сообщений
+    """
+    n = len(messages)
+    if n == 0:
+        return []
+    rk = _chain_keys(keys, n)
+    chain = as_keys(ivs)
+    if len(chain) != n:
+        raise ValueError("Количество векторов инициализации должно совпадать с количеством сообщений.")
+    blocks, lengths, starts = _message_blocks(messages, padding)
+
+    order = np.argsort(-lengths, kind='stable')
+    lengths, starts, chain = lengths[order], starts[order], chain[order]
+    if rk.ndim == 3:
+        rk = rk[order]
+
+    out = np.empty_like(blocks)
+    active = n
+    for i in range(int(lengths[0])):
+        while lengths[active - 1] <= i:
+            active -= 1
+        rows = starts[:active] + i
+        chain[:active] = encrypt_array(chain[:active] ^ blocks[rows], rk if rk.ndim == 2 else rk[:active])
+        out[rows] = chain[:active]
+
+    data = out.reshape(-1).tobytes()
+    result = [b""] * n
+    for start, length, index in zip(starts.tolist(), lengths.tolist(), order.tolist()):
+        result[index] = data[16 * start:16 * (start + length)]
+    return result
+
+
+def cbc_decrypt_many(messages: Sequence[bytes], keys: Union[bytes, BlocksLike, Iterable[bytes]],
+                     ivs: Union[BlocksLike, Iterable[bytes]], padding: bool = True,
+                     chunk_blocks: int = 65536) -> List[bytes]:
+    """
+    Расшифровывает N сообщений CBC; расшифрование не зависит от цепочки,
+    поэтому блоки всех сообщений обрабатываются общими пачками.
+
+    :param messages: N шифртекстов (длины кратны 16)
+    :param keys: общий ключ 16 байт или N ключей
+    :param ivs: N векторов инициализации по 16 байт
+    :param padding: снимать ли PKCS#7
+    :param chunk_blocks: размер пачки в блоках
+    :return: список открытых текстов в порядке сообщений
+    """
+    n = len(messages)
+    if n == 0:
+        return []
+    rk = _chain_keys(keys, n)
+    iv = as_keys(ivs)
+    if len(iv) != n:
+        raise ValueError("Количество векторов инициализации должно совпадать с количеством сообщений.")
+    blocks, lengths, starts = _message_blocks(messages, False)
+
+    # Предыдущий блок шифртекста для каждого блока; для первого блока — IV сообщения
+    previous = np.empty_like(blocks)
+    previous[1:] = blocks[:-1]
+    previous[starts[lengths > 0]] = iv[lengths > 0]
+    owner = np.repeat(np.arange(n), lengths)
+
+    out = np.empty_like(blocks)
+    for offset in range(0, len(blocks), chunk_blocks):
+        part = slice(offset, offset + chunk_blocks)
+        keys_part = rk if rk.ndim == 2 else rk[owner[part]]
+        out[part] = decrypt_array(blocks[part], keys_part) ^ previous[part]
+
+    data = out.reshape(-1).tobytes()
+    result = []
+    for start, length in zip(starts.tolist(), lengths.tolist()):
+        plaintext = data[16 * start:16 * (start + length)]
+        result.append(pkcs7_unpad(plaintext) if padding else plaintext)
+    return result
+
+
+if __name__ == '__main__':
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    example_plaintext = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+
+    encrypted = encrypt_blocks(example_plaintext, example_key)
+    print(f'Шифртекст:   {encrypted.hex()}')
+    print(f'Расшифровка: {decrypt_blocks(encrypted, example_key).hex()}')
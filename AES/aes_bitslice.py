@@ -0,0 +1,214 @@
+from typing import List
+
+from aes import key_expansion
+
+# Битсрез (bitslice): состояние — 16 байт по 8 срезов, срез — целое число Python,
+# в котором бит m — это соответствующий бит блока номер m.
+Byte = List[int]
+State = List[Byte]
+
+# ShiftRows как перестановка 16 байт блока (байт i = строка i % 4, столбец i // 4)
+SHIFT_ROWS = [r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)]
+
+# Таблицы для упаковки: байт -> ASCII '0'/'1' для бита номер b
+_BIT_TO_ASCII = [bytes(0x31 if (x >> b) & 1 else 0x30 for x in range(256)) for b in range(8)]
+_ASCII_TO_BIT = bytes.maketrans(b'01', b'\x00\x01')
+
+
+# ===== Упаковка и распаковка =====
+
+def pack(data: bytes) -> State:
+    """
+    Транспонирует N блоков в 128 срезов.
+
+    :param data: данные, длина которых кратна 16 байтам
+    :return: 16 байт состояния по 8 срезов (индекс среза = номер бита, 0 — младший)
+    """
+    state: State = []
+    for j in range(16):
+        column = bytes(data[j::16])
+        state.append([int(column.translate(_BIT_TO_ASCII[b])[::-1], 2) for b in range(8)])
+    return state
+
+
+def unpack(state: State, n_blocks: int) -> bytes:
+    """
+    Обратное транспонирование 128 срезов в N блоков по 16 байт.
+
+    :param state: состояние из 16 байт по 8 срезов
+    :param n_blocks: количество блоков (ширина среза)
+    :return: данные длиной 16 * n_blocks
+    """
+    out = bytearray(16 * n_blocks)
+    for j in range(16):
+        column = 0
+        for b in range(8):
+            lanes = format(state[j][b], f'0{n_blocks}b')[::-1].encode().translate(_ASCII_TO_BIT)
+            column |= int.from_bytes(lanes, 'little') << b
+        out[j::16] = column.to_bytes(n_blocks, 'little')
+    return bytes(out)
+
+
+# ===== Арифметика GF(2^8) над срезами =====
+
+def _reduce(t: List[int]) -> Byte:
+    """Редукция многочлена степени до 14 по модулю x^8 + x^4 + x^3 + x + 1."""
+    for k in range(14, 7, -1):
+        t[k - 4] ^= t[k]
+        t[k - 5] ^= t[k]
+        t[k - 7] ^= t[k]
+        t[k - 8] ^= t[k]
+    return t[:8]
+
+
+def gf_mul(a: Byte, b: Byte) -> Byte:
+    """Умножение в GF(2^8): 64 AND и XOR над срезами и редукция."""
+    t = [0] * 15
+    for i in range(8):
+        ai = a[i]
+        for j in range(8):
+            t[i + j] ^= ai & b[j]
+    return _reduce(t)
+
+
+def gf_square(a: Byte) -> Byte:
+    """Возведение в квадрат в GF(2^8) — линейная операция, без AND."""
+    t = [0] * 15
+    for i in range(8):
+        t[2 * i] = a[i]
+    return _reduce(t)
+
+
+def gf_inverse(x: Byte) -> Byte:
+    """
+    Обратный элемент x^254 (для нуля даёт ноль, как требует S-box).
+
+    Цепочка: x^2, x^3, x^12, x^15, x^240, x^252, x^254 — 4 умножения и 7 квадратов.
+    """
+    x2 = gf_square(x)
+    x3 = gf_mul(x2, x)
+    x12 = gf_square(gf_square(x3))
+    x15 = gf_mul(x12, x3)
+    x240 = gf_square(gf_square(gf_square(gf_square(x15))))
+    x252 = gf_mul(x240, x12)
+    return gf_mul(x252, x2)
+
+
+def sub_byte(x: Byte, ones: int) -> Byte:
+    """
+    S-box как булева схема: инверсия в GF(2^8) и аффинное преобразование.
+
+    :param x: байт из 8 срезов
+    :param ones: срез из единиц (маска ширины пачки) для XOR с константой 0x63
+    """
+    y = gf_inverse(x)
+    out = [y[i] ^ y[(i + 4) % 8] ^ y[(i + 5) % 8] ^ y[(i + 6) % 8] ^ y[(i + 7) % 8] for i in range(8)]
+    for i in range(8):
+        if (0x63 >> i) & 1:
+            out[i] ^= ones
+    return out
+
+
+def _xtime(a: Byte) -> Byte:
+    """Умножение на x (0x02) в GF(2^8) над срезами."""
+    return [a[7], a[0] ^ a[7], a[1], a[2] ^ a[7], a[3] ^ a[7], a[4], a[5], a[6]]
+
+
+def mix_columns(state: State) -> State:
+    """MixColumns над срезами: только XOR целых чисел."""
+    out: State = []
+    for c in range(0, 16, 4):
+        a = state[c:c + 4]
+        total = [a[0][i] ^ a[1][i] ^ a[2][i] ^ a[3][i] for i in range(8)]
+        for r in range(4):
+            x = _xtime([p ^ q for p, q in zip(a[r], a[(r + 1) % 4])])
+            out.append([a[r][i] ^ total[i] ^ x[i] for i in range(8)])
+    return out
+
+
+# ===== Шифр =====
+
+class BitslicedAES:
+    """
+    Битсрезовая реализация AES-128 на длинных целых Python.
+
+    Каждый из 128 битов состояния хранится в отдельном целом числе, которое
+    несёт этот бит сразу для всех блоков пачки. Одна оценка булевой схемы
+    S-box шифрует все блоки пачки, поэтому выигрыш растёт с шириной пачки.
+    Подходит для CTR и перебора, где много независимых блоков на один ключ.
+    """
+
+    def __init__(self, key: bytes, lanes: int = 4096) -> None:
+        """
+        :param key: ключ шифрования 16 байт
+        :param lanes: максимальное число блоков в одной пачке
+        """
+        self.lanes = lanes
+        expanded = key_expansion(key)
+        # Биты раундовых ключей: rk_bits[round][byte][bit]
+        self.rk_bits = [
+            [[(byte >> b) & 1 for b in range(8)] for word in expanded[4 * r:4 * r + 4] for byte in word]
+            for r in range(11)
+        ]
+
+    def _add_round_key(self, state: State, round_num: int, ones: int) -> None:
+        """XOR с раундовым ключом: инвертируются только срезы с единичным битом ключа."""
+        for j, key_byte in enumerate(self.rk_bits[round_num]):
+            for b in range(8):
+                if key_byte[b]:
+                    state[j][b] ^= ones
+
+    def encrypt_sliced(self, state: State, n_blocks: int) -> State:
+        """
+        Шифрует уже упакованное состояние.
+
+        :param state: 16 байт по 8 срезов шириной n_blocks
+        :param n_blocks: количество блоков в пачке
+        :return: зашифрованное состояние
+        """
+        ones = (1 << n_blocks) - 1
+        state = [byte[:] for byte in state]
+        self._add_round_key(state, 0, ones)
+        for round_num in range(1, 11):
+            state = [sub_byte(state[i], ones) for i in SHIFT_ROWS]
+            if round_num != 10:
+                state = mix_columns(state)
+            self._add_round_key(state, round_num, ones)
+        return state
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Шифрует независимые блоки (ECB) пачками по lanes блоков.
+
+        :param data: данные, длина которых кратна 16 байтам
+        :return: шифртекст той же длины
+        :raises ValueError: если длина данных не кратна 16 байтам
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        step = 16 * self.lanes
+        parts = []
+        for offset in range(0, len(data), step):
+            chunk = data[offset:offset + step]
+            n_blocks = len(chunk) // 16
+            parts.append(unpack(self.encrypt_sliced(pack(chunk), n_blocks), n_blocks))
+        return b"".join(parts)
+
+    def ctr_keystream(self, counter: bytes, n_blocks: int) -> bytes:
+        """
+        Генерирует n_blocks блоков гаммы CTR (счётчик — 128-битное big-endian число).
+
+        :param counter: начальный блок счётчика 16 байт
+        :param n_blocks: количество блоков гаммы
+        :return: гамма длиной 16 * n_blocks
+        """
+        start = int.from_bytes(counter, 'big')
+        counters = b"".join(((start + i) % (1 << 128)).to_bytes(16, 'big') for i in range(n_blocks))
+        return self.encrypt_blocks(counters)
+
+
+if __name__ == '__main__':
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    example_plaintext = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+
+    print(f'Шифртекст: {BitslicedAES(example_key).encrypt_blocks(example_plaintext).hex()}')
@@ -0,0 +1,188 @@
+import os
+from typing import Callable, Dict, List
+
+from aes import AES, inv_s_box, s_box, td0, td1, td2, td3, te0, te1, te2, te3
+
+# Порядок столбцов-источников для байт 1..3 в раунде: ShiftRows и InvShiftRows
+ENCRYPT_SHIFTS = (1, 2, 3)
+DECRYPT_SHIFTS = (3, 2, 1)
+
+
+# ===== Генерация исходного кода =====
+
+def _round_lines(indent: str, source: str, ek: List[int], shifts: tuple) -> List[str]:
+    """
+    Строки кода всех раундов: состояние — локальные s0..s3, ключи — литералы.
+
+    Args:
+        indent: Отступ строк
+        source: Выражение, дающее блок как 128-битное число
+        ek: Расширенный ключ (44 слова)
+        shifts: Сдвиги столбцов для байт 1..3 (ShiftRows или InvShiftRows)
+
+    Returns:
+        Строки кода; результат раунда шифрования остаётся в переменной y
+    """
+    a, b, c = shifts
+    lines = [f"{indent}s{j} = {source} >> {96 - 32 * j} & 0xFFFFFFFF ^ {ek[j]:#010x}" for j in range(4)]
+    for r in range(1, 10):
+        for j in range(4):
+            lines.append(
+                f"{indent}u{j} = t0[s{j} >> 24] ^ t1[s{(j + a) % 4} >> 16 & 0xFF] "
+                f"^ t2[s{(j + b) % 4} >> 8 & 0xFF] ^ t3[s{(j + c) % 4} & 0xFF] ^ {ek[4 * r + j]:#010x}"
+            )
+        lines.append(f"{indent}s0, s1, s2, s3 = u0, u1, u2, u3")
+    # Финальный раунд без MixColumns: только S-box и сдвиг строк
+    words = [
+        f"((sb[s{j} >> 24] << 24 | sb[s{(j + a) % 4} >> 16 & 0xFF] << 16 "
+        f"| sb[s{(j + b) % 4} >> 8 & 0xFF] << 8 | sb[s{(j + c) % 4} & 0xFF]) ^ {ek[40 + j]:#010x}) << {96 - 32 * j}"
+        for j in range(4)
+    ]
+    lines.append(f"{indent}y = (" + f"\n{indent}     | ".join(words) + ")")
+    return lines
+
+
+def generate_source(name: str, ek: List[int], decrypt: bool = False) -> str:
+    """
+    Исходный код функций name_block(block) и name_blocks(data) для одного ключа.
+
+    Все 10 раундов развёрнуты, слова раундовых ключей подставлены как
+    константы, длина блока проверяется так же, как в AES.encrypt_block, таблицы передаются аргументами по умолчанию (локальные
+    переменные), а блок читается и пишется одним 128-битным числом.
+
+    Args:
+        name: Префикс имён функций
+        ek: Расширенный ключ (для расшифрования — из inv_key_expansion_words)
+        decrypt: Генерировать ли обратный шифр
+
+    Returns:
+        Исходный код модуля
+    """
+    shifts = DECRYPT_SHIFTS if decrypt else ENCRYPT_SHIFTS
+    tables = "td" if decrypt else "te"
+    box = "inv_s_box" if decrypt else "s_box"
+    defaults = f"t0={tables}0, t1={tables}1, t2={tables}2, t3={tables}3, sb={box}, from_bytes=int.from_bytes"
+    message = "Длина зашифрованного текста должна быть 16 байт." if decrypt else "Длина открытого текста должна быть 16 байт."
+    return "\n".join([
+        f"def {name}_block(block, {defaults}):",
+        "    if len(block) != 16:",
+        f"        raise ValueError({message!r})",
+        "    x = from_bytes(block, 'big')",
+        *_round_lines("    ", "x", ek, shifts),
+        "    return y.to_bytes(16, 'big')",
+        "",
+        "",
+        f"def {name}_blocks(data, {defaults}):",
+        "    view = memoryview(data)",
+        "    out = []",
+        "    append = out.append",
+        "    for i in range(0, len(view), 16):",
+        "        x = from_bytes(view[i:i + 16], 'big')",
+        *_round_lines("        ", "x", ek, shifts),
+        "        append(y.to_bytes(16, 'big'))",
+        "    return b''.join(out)",
+        "",
+    ])
+
+
+# ===== Компиляция =====
+
+class CompiledAES:
+    """
+    AES-128, специализированный под один ключ.
+
+    Функции шифрования генерируются как исходный код без циклов по раундам
+    и без индексации раундового ключа, компилируются через exec и при
+    создании сверяются с эталонной реализацией из aes.py.
+    """
+
+    block_size = 16
+
+    def __init__(self, key: bytes) -> None:
+        """
+        Args:
+            key: Ключ шифрования длиной 16 байт
+
+        Raises:
+            ValueError: Если длина ключа не равна 16 байтам или сгенерированный
+                код расходится с эталоном
+        """
+        reference = AES(key)
+        self.key = reference.key
+        namespace: Dict[str, object] = {
+            'te0': te0, 'te1': te1, 'te2': te2, 'te3': te3, 's_box': s_box,
+            'td0': td0, 'td1': td1, 'td2': td2, 'td3': td3, 'inv_s_box': inv_s_box,
+        }
+        self.source = generate_source('encrypt', reference.ek) + "\n\n" + generate_source('decrypt', reference.dk, True)
+        exec(compile(self.source, '<aes_codegen>', 'exec'), namespace)
+        self.encrypt_block: Callable[[bytes], bytes] = namespace['encrypt_block']
+        self.decrypt_block: Callable[[bytes], bytes] = namespace['decrypt_block']
+        self._encrypt_blocks = namespace['encrypt_blocks']
+        self._decrypt_blocks = namespace['decrypt_blocks']
+        self._validate(reference)
+
+    def _validate(self, reference: AES) -> None:
+        """Сверяет сгенерированные функции с эталонным движком."""
+        samples = [bytes(16), bytes([0xFF] * 16), os.urandom(16), os.urandom(16)]
+        for block in samples:
+            expected = reference.encrypt_block_reference(block)
+            if self.encrypt_block(block) != expected or self.decrypt_block(expected) != block:
+                raise ValueError("Сгенерированный код AES не совпадает с эталонной реализацией.")
+        data = b"".join(samples)
+        if self.encrypt_blocks(data) != reference.encrypt_blocks(data) or self.decrypt_blocks(reference.encrypt_blocks(data)) != data:
+            raise ValueError("Сгенерированный код AES не совпадает с эталонной реализацией.")
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Шифрует последовательность блоков независимо друг от друга (ECB).
+
+        Raises:
+            ValueError: Если длина данных не кратна 16 байтам
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        return self._encrypt_blocks(data) if data else b""
+
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Расшифровывает последовательность блоков независимо друг от друга (ECB).
+
+        Raises:
+            ValueError: Если длина данных не кратна 16 байтам
+        """
+        if len(data) % 16 != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        return self._decrypt_blocks(data) if data else b""
+
+
+def compile_cipher(key: bytes) -> CompiledAES:
+    """
+    Специализированный шифр для ключа.
+
+    Компиляция заметно дороже создания контекста AES, поэтому результат
+    стоит создать один раз и хранить рядом с ключом; модуль ключи не кеширует.
+
+    Args:
+        key: Ключ шифрования длиной 16 байт (bytes, bytearray или memoryview)
+
+    Returns:
+        Скомпилированный контекст с encrypt_block/decrypt_block/encrypt_blocks/decrypt_blocks
+
+    Raises:
+        ValueError: Если длина ключа не равна 16 байтам
+    """
+    key = bytes(key)
+    if len(key) != 16:
+        raise ValueError("Длина ключа должна быть 16 байт.")
+    return CompiledAES(key)
+
+
+if __name__ == '__main__':
+    # Тестовый вектор из спецификации FIPS-197
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    example_plaintext = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+
+    cipher = compile_cipher(example_key)
+    ciphertext = cipher.encrypt_block(example_plaintext)
+    print(f'Шифртекст:   {ciphertext.hex()}')
+    print(f'Расшифровка: {cipher.decrypt_block(ciphertext).hex()}')
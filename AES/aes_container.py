@@ -0,0 +1,317 @@
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+from typing import BinaryIO, List, Optional, Tuple
+
+from aes_gcm import AESGCM
+from aes_modes import encryptor
+
+# Формат контейнера:
+#   заголовок  | MAGIC | версия | шифр | резерв | размер порции | смещение индекса (0 — не завершён)
+#   порции     | шифртекст порции [+ тег GCM 16 байт] ...
+#   индекс     | INDEX_MAGIC | количество порций | (смещение, длина открытого текста, nonce) на порцию
+# Смещение индекса в заголовке обновляется последним, поэтому до этого
+# момента файл читается по прежнему индексу.
+MAGIC = b'AESC'
+INDEX_MAGIC = b'AESI'
+VERSION = 2
+HEADER = struct.Struct('>4sBBHIQ')
+HEADER_AAD_SIZE = HEADER.size - 8  # неизменяемая часть заголовка, входит в AAD порций
+INDEX_HEAD = struct.Struct('>4sQ')
+INDEX_ENTRY = struct.Struct('>QI8s')
+
+CIPHERS = {'AES-128-CTR': 1, 'AES-128-GCM': 2}
+CIPHER_NAMES = {value: name for name, value in CIPHERS.items()}
+TAG_SIZE = 16
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+IndexEntry = Tuple[int, int, bytes]
+
+
+# ===== Шифрование отдельной порции =====
+
+class _ChunkCipher:
+    """
+    Независимое шифрование порции: nonce порции = nonce сеанса записи || номер порции.
+
+    В режиме GCM в AAD входят заголовок, номер порции и признак последней
+    порции (как в конструкции STREAM): отбросить хвостовые порции и выдать
+    предыдущую за последнюю нельзя — её тег не сойдётся.
+    """
+
+    def __init__(self, key: bytes, cipher: int, header: bytes) -> None:
+        self.key = key
+        self.cipher = cipher
+        self.header = header[:HEADER_AAD_SIZE]
+        self._gcm = AESGCM(key) if cipher == CIPHERS['AES-128-GCM'] else None
+
+    @staticmethod
+    def _counter(nonce: bytes, index: int, block: int = 0) -> bytes:
+        """Блок счётчика CTR для блока номер block внутри порции index."""
+        return nonce + index.to_bytes(4, 'big') + block.to_bytes(4, 'big')
+
+    def _aad(self, index: int, final: bool) -> bytes:
+        return self.header + index.to_bytes(4, 'big') + bytes([final])
+
+    def encrypt(self, index: int, nonce: bytes, data: bytes, final: bool) -> bytes:
+        """Шифрует порцию; для GCM к шифртексту дописывается тег."""
+        if self._gcm is not None:
+            ciphertext, tag = self._gcm.encrypt(nonce + index.to_bytes(4, 'big'), data, self._aad(index, final))
+            return ciphertext + tag
+        enc = encryptor(self.key, 'CTR', self._counter(nonce, index))
+        return enc.update(data) + enc.finalize()
+
+    def decrypt(self, index: int, nonce: bytes, stored: bytes, final: bool,
+                start: int = 0, end: Optional[int] = None) -> bytes:
+        """
+        Расшифровывает байты [start, end) открытого текста порции.
+
+        В режиме CTR расшифровываются только блоки, покрывающие диапазон;
+        в режиме GCM порция проверяется и расшифровывается целиком.
+
+        :raises ValueError: если тег GCM не совпадает
+        """
+        if self._gcm is not None:
+            plaintext = self._gcm.decrypt(nonce + index.to_bytes(4, 'big'), stored[:-TAG_SIZE],
+                                          stored[-TAG_SIZE:], self._aad(index, final))
+            return plaintext[start:end]
+        end = len(stored) if end is None else end
+        first_block = start // 16
+        dec = encryptor(self.key, 'CTR', self._counter(nonce, index, first_block))
+        plaintext = dec.update(stored[first_block * 16:end]) + dec.finalize()
+        return plaintext[start - first_block * 16:]
+
+
+# ===== Запись =====
+
+class ContainerWriter:
+    """
+    Потоковая запись зашифрованного контейнера.
+
+    Данные копятся до размера порции, каждая полная порция шифруется и сразу
+    пишется в файл; последняя полная порция придерживается до следующей
+    записи, чтобы при close() зашифровать её с признаком последней. Индекс
+    порций дописывается в конец при close(), и только после этого заголовок
+    начинает указывать на него.
+
+    append() продолжает существующий контейнер, не изменяя записанных байт:
+    бывшая последняя порция перешифровывается как обычная и вместе с новыми
+    порциями пишется после старого индекса. Пока close() не завершён,
+    заголовок указывает на старый индекс, поэтому сбой во время дозаписи
+    оставляет прежнее содержимое читаемым. Каждый сеанс записи получает
+    свой случайный nonce, так что перешифрованные порции nonce не повторяют.
+    """
+
+    def __init__(self, file: BinaryIO, key: bytes, cipher: str = 'AES-128-CTR',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, nonce: Optional[bytes] = None) -> None:
+        """
+        :param file: файл, открытый на запись в двоичном режиме ('wb' или 'w+b')
+        :param key: ключ шифрования 16 байт
+        :param cipher: имя шифра из CIPHERS
+        :param chunk_size: размер порции открытого текста в байтах (кратен 16)
+        :param nonce: nonce сеанса записи 8 байт (по умолчанию случайный)
+        """
+        if cipher not in CIPHERS:
+            raise ValueError(f"Неизвестный шифр {cipher!r}, ожидается один из {tuple(CIPHERS)}.")
+        if chunk_size <= 0 or chunk_size % 16 != 0:
+            raise ValueError("Размер порции должен быть положительным и кратным 16 байтам.")
+        nonce = os.urandom(8) if nonce is None else nonce
+        if len(nonce) != 8:
+            raise ValueError("Длина nonce должна быть 8 байт.")
+        header = HEADER.pack(MAGIC, VERSION, CIPHERS[cipher], 0, chunk_size, 0)
+        self._setup(file, key, header, nonce)
+        file.write(header)
+        self._offset = HEADER.size
+
+    def _setup(self, file: BinaryIO, key: bytes, header: bytes, nonce: bytes) -> None:
+        """Общая инициализация для нового и дописываемого контейнера."""
+        _, _, cipher, _, chunk_size, _ = HEADER.unpack(header)
+        self._file = file
+        self._buffer = b""
+        self._index: List[IndexEntry] = []
+        self._offset = 0
+        self._closed = False
+        self.chunk_size = chunk_size
+        self.nonce = nonce
+        self._chunks = _ChunkCipher(key, cipher, header)
+
+    @classmethod
+    def append(cls, file: BinaryIO, key: bytes) -> 'ContainerWriter':
+        """
+        Продолжает запись в существующий контейнер.
+
+        Индекс читается в память, последняя порция расшифровывается (с
+        проверкой тега в GCM) и возвращается в буфер; новые порции пишутся в
+        конец файла, индекс и заголовок обновляются при close().
+
+        :param file: файл контейнера, открытый в режиме 'r+b'
+        :param key: ключ шифрования 16 байт
+        :raises ValueError: если контейнер повреждён или ключ неверен (GCM)
+        """
+        header, index = _read_layout(file)
+        writer = cls.__new__(cls)
+        writer._setup(file, key, header, os.urandom(8))
+        offset, length, nonce = index[-1]
+        tag = TAG_SIZE if writer._chunks.cipher == CIPHERS['AES-128-GCM'] else 0
+        file.seek(offset)
+        writer._buffer = writer._chunks.decrypt(len(index) - 1, nonce, file.read(length + tag), final=True)
+        writer._index = index[:-1]
+        writer._offset = file.seek(0, os.SEEK_END)
+        return writer
+
+    def _flush_chunk(self, data: bytes, final: bool) -> None:
+        """Шифрует и записывает одну порцию, добавляя её в индекс."""
+        stored = self._chunks.encrypt(len(self._index), self.nonce, data, final)
+        self._file.write(stored)
+        self._index.append((self._offset, len(data), self.nonce))
+        self._offset += len(stored)
+
+    def write(self, data: bytes) -> None:
+        """Добавляет данные; полные порции, кроме последней, шифруются и записываются сразу."""
+        buffer = self._buffer + bytes(data)
+        size = self.chunk_size
+        full = (len(buffer) - 1) // size * size if buffer else 0
+        for i in range(0, full, size):
+            self._flush_chunk(buffer[i:i + size], final=False)
+        self._buffer = buffer[full:]
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Записывает последнюю порцию (возможно пустую) и индекс, затем
+        переключает на новый индекс смещение в заголовке.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_chunk(self._buffer, final=True)
+        self._buffer = b""
+        index_offset = self._offset
+        self._file.write(INDEX_HEAD.pack(INDEX_MAGIC, len(self._index)))
+        self._file.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in self._index))
+        self._sync()
+        self._file.seek(HEADER_AAD_SIZE)
+        self._file.write(index_offset.to_bytes(8, 'big'))
+        self._sync()
+        self._file.seek(0, os.SEEK_END)
+
+    def __enter__(self) -> 'ContainerWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ===== Чтение =====
+
+def _read_layout(file: BinaryIO) -> Tuple[bytes, List[IndexEntry]]:
+    """Читает заголовок и индекс контейнера, на который указывает заголовок."""
+    file.seek(0)
+    header = file.read(HEADER.size)
+    if len(header) != HEADER.size or header[:4] != MAGIC:
+        raise ValueError("Файл не является контейнером AES.")
+    if header[4] != VERSION:
+        raise ValueError(f"Неподдерживаемая версия контейнера: {header[4]}.")
+    index_offset = HEADER.unpack(header)[5]
+    if index_offset == 0:
+        raise ValueError("Контейнер не завершён: индекс порций не найден.")
+
+    file.seek(index_offset)
+    raw = file.read(INDEX_HEAD.size)
+    if len(raw) != INDEX_HEAD.size or raw[:4] != INDEX_MAGIC:
+        raise ValueError("Индекс порций повреждён.")
+    _, count = INDEX_HEAD.unpack(raw)
+    raw = file.read(count * INDEX_ENTRY.size)
+    if count == 0 or len(raw) != count * INDEX_ENTRY.size:
+        raise ValueError("Индекс порций повреждён.")
+    index = [INDEX_ENTRY.unpack_from(raw, i * INDEX_ENTRY.size) for i in range(count)]
+    return header, index
+
+
+class ContainerReader:
+    """
+    Чтение произвольного диапазона открытого текста из контейнера через mmap.
+
+    Расшифровываются только порции, покрывающие запрошенный диапазон. В
+    режиме GCM при открытии проверяется последняя порция с признаком
+    последней, поэтому контейнер с отброшенными хвостовыми порциями не
+    откроется.
+    """
+
+    def __init__(self, file: BinaryIO, key: bytes) -> None:
+        """
+        :param file: файл контейнера, открытый в режиме 'rb'
+        :param key: ключ шифрования 16 байт
+        :raises ValueError: если контейнер повреждён или усечён
+        """
+        header, index = _read_layout(file)
+        _, _, cipher, _, self.chunk_size, _ = HEADER.unpack(header)
+        if cipher not in CIPHER_NAMES:
+            raise ValueError(f"Неизвестный шифр контейнера: {cipher}.")
+        self.cipher = CIPHER_NAMES[cipher]
+        self._chunks = _ChunkCipher(key, cipher, header)
+        self._index = index
+        self._tag = TAG_SIZE if self.cipher == 'AES-128-GCM' else 0
+        # Начало каждой порции в координатах открытого текста
+        self._starts = []
+        total = 0
+        for _, length, _ in index:
+            self._starts.append(total)
+            total += length
+        self.size = total
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._tag:
+            self._read_chunk(len(index) - 1, 0, 0)
+
+    def _read_chunk(self, i: int, start: int, end: int) -> bytes:
+        """Байты [start, end) открытого текста порции номер i."""
+        offset, length, nonce = self._index[i]
+        stored = self._map[offset:offset + length + self._tag]
+        return self._chunks.decrypt(i, nonce, stored, i == len(self._index) - 1, start, end)
+
+    def read(self, start: int, end: int) -> bytes:
+        """
+        Возвращает открытый текст [start, end).
+
+        :param start: начальное смещение (включительно)
+        :param end: конечное смещение (не включительно), обрезается по размеру
+        """
+        end = min(end, self.size)
+        if start < 0 or start >= end:
+            return b""
+        parts = []
+        i = bisect.bisect_right(self._starts, start) - 1
+        while i < len(self._index) and self._starts[i] < end:
+            chunk_start = self._starts[i]
+            parts.append(self._read_chunk(i, max(start - chunk_start, 0),
+                                          min(end - chunk_start, self._index[i][1])))
+            i += 1
+        return b"".join(parts)
+
+    def close(self) -> None:
+        """Закрывает отображение файла."""
+        self._map.close()
+
+    def __enter__(self) -> 'ContainerReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    message = bytes(range(256)) * 1000
+
+    with tempfile.TemporaryFile() as container:
+        with ContainerWriter(container, example_key, 'AES-128-GCM', chunk_size=4096) as writer:
+            writer.write(message[:150000])
+        with ContainerWriter.append(container, example_key) as writer:
+            writer.write(message[150000:])
+        with ContainerReader(container, example_key) as reader:
+            print(f'Размер: {reader.size}, диапазон [100000, 100016): {reader.read(100000, 100016).hex()}')
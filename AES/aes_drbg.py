@@ -0,0 +1,185 @@
+import os
+import random
+from typing import Optional
+
+from aes_backend import block_cipher
+
+BLOCK_SIZE = 16
+KEY_SIZE = 16
+SEED_SIZE = KEY_SIZE + BLOCK_SIZE  # seedlen для AES-128
+MAX_REQUEST = 1 << 16              # максимум байт за один вызов generate (2^19 бит)
+RESEED_INTERVAL = 1 << 48          # максимум вызовов generate между пересевами
+BUFFER_SIZE = 1 << 14              # сколько байт вырабатывается за одно пополнение буфера
+
+
+class CtrDRBG(random.Random):
+    """
+    Детерминированный генератор случайных бит CTR_DRBG на AES-128
+    (NIST SP 800-90A, вариант без функции деривации).
+
+    Байты вырабатываются пачками по buffer_size в один вызов encrypt_blocks и
+    отдаются из буфера, поэтому стоимость блочного шифра — одна операция на
+    16 байт, а не на каждый запрос. Класс наследует random.Random, так что
+    randint, randrange, choice, shuffle, sample и т.д. работают поверх него.
+
+    В отличие от random.Random, затравка — только энтропия ровно 32 байта
+    (целые числа и строки не принимаются), а состояние нельзя получить через
+    getstate(), скопировать или сериализовать: копии выдавали бы одинаковые
+    ключи.
+    """
+
+    def __init__(self, entropy: Optional[bytes] = None, personalization: bytes = b"",
+                 buffer_size: int = BUFFER_SIZE, reseed_interval: int = RESEED_INTERVAL) -> None:
+        """
+        :param entropy: начальная энтропия ровно 32 байта (по умолчанию os.urandom);
+                        фиксированное значение даёт воспроизводимую последовательность
+        :param personalization: строка персонализации (не длиннее 32 байт)
+        :param buffer_size: размер порции буфера в байтах (кратен 16, не больше 65536)
+        :param reseed_interval: после стольких пополнений буфера генератор
+                                пересевается из os.urandom
+        """
+        if buffer_size <= 0 or buffer_size % BLOCK_SIZE != 0 or buffer_size > MAX_REQUEST:
+            raise ValueError(f"Размер буфера должен быть кратен 16 и не больше {MAX_REQUEST} байт.")
+        self.buffer_size = buffer_size
+        self.reseed_interval = reseed_interval
+        self._personalization = personalization
+        super().__init__(entropy)
+
+    # --- механизм SP 800-90A ---
+
+    @staticmethod
+    def _entropy(entropy: Optional[bytes]) -> bytes:
+        """Энтропия ровно seedlen байт (по умолчанию os.urandom)."""
+        if entropy is None:
+            return os.urandom(SEED_SIZE)
+        if not isinstance(entropy, (bytes, bytearray, memoryview)):
+            raise TypeError("Энтропия CTR_DRBG задаётся байтами, а не числом или строкой.")
+        if len(entropy) != SEED_SIZE:
+            raise ValueError(f"Длина энтропии должна быть ровно {SEED_SIZE} байта.")
+        return bytes(entropy)
+
+    @staticmethod
+    def _seed_material(data: bytes, extra: bytes = b"") -> int:
+        """Материал затравки: data XOR extra, дополненные нулями до 32 байт."""
+        if len(data) > SEED_SIZE or len(extra) > SEED_SIZE:
+            raise ValueError(f"Длина энтропии и дополнительных данных — не больше {SEED_SIZE} байт.")
+        return int.from_bytes(data.ljust(SEED_SIZE, b"\0"), 'big') ^ int.from_bytes(extra.ljust(SEED_SIZE, b"\0"), 'big')
+
+    def _blocks(self, n: int) -> bytes:
+        """n блоков E_K(V + 1), E_K(V + 2), ...; V сдвигается на n."""
+        v = self._v
+        counters = b"".join(((v + i) % (1 << 128)).to_bytes(BLOCK_SIZE, 'big') for i in range(1, n + 1))
+        self._v = (v + n) % (1 << 128)
+        return self._cipher.encrypt_blocks(counters)
+
+    def _update(self, provided: int) -> None:
+        """Функция обновления состояния CTR_DRBG_Update."""
+        temp = int.from_bytes(self._blocks(SEED_SIZE // BLOCK_SIZE), 'big') ^ provided
+        temp = temp.to_bytes(SEED_SIZE, 'big')
+        self._cipher = block_cipher(temp[:KEY_SIZE])
+        self._v = int.from_bytes(temp[KEY_SIZE:], 'big')
+
+    def seed(self, a: Optional[bytes] = None, version: int = 2) -> None:
+        """
+        (Пере)инициализирует генератор энтропией a (по умолчанию os.urandom).
+
+        Вызывается также из конструктора random.Random.
+
+        :param a: энтропия ровно 32 байта
+        :raises TypeError: если a не байты
+        :raises ValueError: если длина a не равна 32 байтам
+        """
+        entropy = self._entropy(a)
+        self._cipher = block_cipher(bytes(KEY_SIZE))
+        self._v = 0
+        self._update(self._seed_material(entropy, self._personalization))
+        self._counter = 1
+        self._buffer = b""
+        self._position = 0
+        self.gauss_next = None
+
+    def reseed(self, entropy: Optional[bytes] = None, additional: bytes = b"") -> None:
+        """
+        Подмешивает новую энтропию в состояние, сохраняя его.
+
+        Невыданный остаток буфера отбрасывается.
+
+        :param entropy: энтропия ровно 32 байта (по умолчанию os.urandom)
+        :param additional: дополнительные данные (не длиннее 32 байт)
+        :raises ValueError: если длина энтропии не равна 32 байтам
+        """
+        self._update(self._seed_material(self._entropy(entropy), additional))
+        self._counter = 1
+        self._buffer = b""
+        self._position = 0
+
+    def generate(self, length: int, additional: bytes = b"") -> bytes:
+        """
+        Один вызов CTR_DRBG_Generate в обход буфера.
+
+        :param length: количество байт (не больше 65536)
+        :param additional: дополнительные данные (не длиннее 32 байт)
+        :return: случайные байты
+        """
+        if length > MAX_REQUEST:
+            raise ValueError(f"За один вызов можно получить не больше {MAX_REQUEST} байт.")
+        if self._counter > self.reseed_interval:
+            self.reseed()
+        provided = self._seed_material(additional) if additional else 0
+        if additional:
+            self._update(provided)
+        output = self._blocks(-(-length // BLOCK_SIZE))[:length]
+        self._update(provided)
+        self._counter += 1
+        return output
+
+    # --- буферизованный вывод ---
+
+    def randbytes(self, n: int) -> bytes:
+        """n случайных байт из буфера."""
+        available = len(self._buffer) - self._position
+        if n <= available:
+            start = self._position
+            self._position += n
+            return self._buffer[start:self._position]
+
+        parts = [self._buffer[self._position:]]
+        need = n - available
+        while need >= self.buffer_size:
+            parts.append(self.generate(self.buffer_size))
+            need -= self.buffer_size
+        self._buffer = self.generate(self.buffer_size)
+        self._position = need
+        parts.append(self._buffer[:need])
+        return b"".join(parts)
+
+    def getrandbits(self, k: int) -> int:
+        """Случайное число из k бит."""
+        if k < 0:
+            raise ValueError("Количество бит должно быть неотрицательным.")
+        if k == 0:
+            return 0
+        return int.from_bytes(self.randbytes((k + 7) // 8), 'big') >> (-k % 8)
+
+    def random(self) -> float:
+        """Случайное число с плавающей точкой из [0, 1)."""
+        return (int.from_bytes(self.randbytes(7), 'big') >> 3) * 2.0 ** -53
+
+    def getstate(self):
+        """Не поддерживается: копирование и сериализация дали бы две одинаковые последовательности."""
+        raise TypeError("Состояние CTR_DRBG не экспортируется: генератор нельзя копировать и сериализовать.")
+
+    def setstate(self, state) -> None:
+        """Не поддерживается (см. getstate)."""
+        raise TypeError("Состояние CTR_DRBG не импортируется: генератор нельзя копировать и сериализовать.")
+
+
+if __name__ == '__main__':
+    drbg = CtrDRBG(bytes(range(32)))
+
+    print(f'Байты:        {drbg.randbytes(16).hex()}')
+    print(f'Числа:        {[drbg.randint(1, 100) for _ in range(8)]}')
+    deck = list(range(10))
+    drbg.shuffle(deck)
+    print(f'Перестановка: {deck}')
+    print(f'Выборка:      {"".join(drbg.sample("abcdefghijklmnopqrstuvwxyz", 8))}')
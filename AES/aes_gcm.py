@@ -0,0 +1,250 @@
+import hmac
+from typing import List, Optional, Tuple
+
+from aes_backend import block_cipher
+from aes_modes import xor_bytes
+
+BLOCK_SIZE = 16
+TAG_SIZE = 16
+# Многочлен редукции GF(2^128) в битовом порядке GCM: x^128 + x^7 + x^2 + x + 1
+R = 0xE1 << 120
+
+
+# ===== GHASH =====
+
+def build_ghash_tables(h: bytes) -> List[List[int]]:
+    """
+    Строит 8-битные таблицы Шоупа для умножения на H в GF(2^128).
+
+    tables[j][b] = (байт b на позиции j блока) · H. Умножение X · H сводится
+    к 16 обращениям к таблицам и XOR без редукции в цикле.
+
+    :param h: хеш-ключ H = E_K(0^128), 16 байт
+    :return: 16 таблиц по 256 128-битных чисел
+    """
+    # v[k] = H · x^k; в порядке GCM умножение на x — сдвиг вправо с редукцией
+    v = [int.from_bytes(h, 'big')]
+    for _ in range(127):
+        last = v[-1]
+        v.append((last >> 1) ^ R if last & 1 else last >> 1)
+
+    tables = []
+    for j in range(16):
+        table = [0] * 256
+        for b in range(1, 256):
+            low = b & -b  # младший установленный бит байта
+            table[b] = table[b ^ low] ^ v[8 * j + 8 - low.bit_length()]
+        tables.append(table)
+    return tables
+
+
+class GHash:
+    """GHASH по ключу H на предвычисленных таблицах (обрабатывает целые блоки)."""
+
+    def __init__(self, tables: List[List[int]]) -> None:
+        self.tables = tables
+        self.y = 0
+
+    def update(self, data: bytes) -> None:
+        """
+        Добавляет в хеш данные, длина которых кратна 16 байтам.
+
+        :param data: целое число блоков
+        """
+        tables = self.tables
+        y = self.y
+        for i in range(0, len(data), BLOCK_SIZE):
+            x = (y ^ int.from_bytes(data[i:i + BLOCK_SIZE], 'big')).to_bytes(BLOCK_SIZE, 'big')
+            y = 0
+            for table, byte in zip(tables, x):
+                y ^= table[byte]
+        self.y = y
+
+    def digest(self) -> bytes:
+        """Текущее значение хеша, 16 байт."""
+        return self.y.to_bytes(BLOCK_SIZE, 'big')
+
+
+# ===== Потоковый GCM =====
+
+class GCMStream:
+    """
+    Одно сообщение AES-GCM: инкрементальные AAD и данные за один проход.
+
+    Сначала вызываются update_aad() (любое число раз), затем update() для
+    данных, в конце finalize(). Между вызовами хранится не больше блока.
+    """
+
+    def __init__(self, context: 'AESGCM', nonce: bytes, decrypt: bool) -> None:
+        if not nonce:
+            raise ValueError("Nonce не может быть пустым.")
+        self.decrypt = decrypt
+        self._cipher = context.cipher
+        self._ghash = GHash(context.tables)
+
+        if len(nonce) == 12:
+            j0 = nonce + b"\x00\x00\x00\x01"
+        else:
+            nonce_hash = GHash(context.tables)
+            padded = nonce + bytes(-len(nonce) % BLOCK_SIZE)
+            nonce_hash.update(padded + bytes(8) + (8 * len(nonce)).to_bytes(8, 'big'))
+            j0 = nonce_hash.digest()
+        self._tag_mask = self._cipher.encrypt_block(j0)
+        self._prefix = j0[:12]
+        self._counter = (int.from_bytes(j0[12:], 'big') + 1) & 0xFFFFFFFF
+
+        self._aad_len = 0
+        self._data_len = 0
+        self._pending = b""     # неполный блок, ожидающий GHASH (AAD или шифртекст)
+        self._keystream = b""   # неиспользованный остаток гаммы
+        self._aad_done = False
+        self._finalized = False
+
+    def _check_open(self) -> None:
+        """Проверяет, что finalize() ещё не вызывался."""
+        if self._finalized:
+            raise ValueError("Сообщение GCM уже завершено.")
+
+    def _hash(self, data: bytes) -> None:
+        """Добавляет данные в GHASH, придерживая неполный блок."""
+        data = self._pending + data
+        ready = len(data) - len(data) % BLOCK_SIZE
+        self._ghash.update(data[:ready])
+        self._pending = data[ready:]
+
+    def _flush_pending(self) -> None:
+        """Дополняет неполный блок нулями и добавляет его в GHASH."""
+        if self._pending:
+            self._ghash.update(self._pending + bytes(BLOCK_SIZE - len(self._pending)))
+            self._pending = b""
+
+    def update_aad(self, data: bytes) -> None:
+        """
+        Добавляет порцию дополнительных аутентифицируемых данных.
+
+        :raises ValueError: если уже начата обработка данных сообщения
+        """
+        self._check_open()
+        if self._aad_done:
+            raise ValueError("AAD должны подаваться до данных сообщения.")
+        self._aad_len += len(data)
+        self._hash(bytes(data))
+
+    def _next_keystream(self, length: int) -> bytes:
+        """Возвращает length байт гаммы GCTR (инкремент младших 32 бит счётчика)."""
+        parts = [self._keystream]
+        need = length - len(self._keystream)
+        while need > 0:
+            block = self._prefix + self._counter.to_bytes(4, 'big')
+            parts.append(self._cipher.encrypt_block(block))
+            self._counter = (self._counter + 1) & 0xFFFFFFFF
+            need -= BLOCK_SIZE
+        keystream = b"".join(parts)
+        self._keystream = keystream[length:]
+        return keystream[:length]
+
+    def update(self, data: bytes) -> bytes:
+        """
+        Шифрует (или расшифровывает) порцию данных и добавляет шифртекст в GHASH.
+
+        :param data: порция данных произвольной длины
+        :return: результат той же длины
+        """
+        self._check_open()
+        if not self._aad_done:
+            self._flush_pending()
+            self._aad_done = True
+        data = bytes(data)
+        out = xor_bytes(data, self._next_keystream(len(data)))
+        self._data_len += len(data)
+        self._hash(data if self.decrypt else out)
+        return out
+
+    def _compute_tag(self) -> bytes:
+        """Завершает GHASH блоком длин и маскирует результат E_K(J0)."""
+        self._check_open()
+        self._finalized = True
+        self._flush_pending()
+        self._ghash.update((8 * self._aad_len).to_bytes(8, 'big') + (8 * self._data_len).to_bytes(8, 'big'))
+        return xor_bytes(self._ghash.digest(), self._tag_mask)
+
+    def finalize(self, tag: Optional[bytes] = None) -> bytes:
+        """
+        Завершает сообщение.
+
+        При шифровании возвращает тег аутентификации. При расшифровании
+        сверяет переданный тег и возвращает его же.
+
+        :param tag: ожидаемый тег (только при расшифровании)
+        :return: тег аутентификации 16 байт
+        :raises ValueError: если тег не передан или не совпадает
+        """
+        computed = self._compute_tag()
+        if not self.decrypt:
+            return computed
+        if tag is None or not hmac.compare_digest(computed, tag):
+            raise ValueError("Ошибка аутентификации: тег не совпадает.")
+        return tag
+
+
+class AESGCM:
+    """
+    Контекст AES-GCM для одного ключа.
+
+    Ключ AES расширяется, а таблицы GHASH строятся один раз, поэтому
+    каждое новое сообщение под этим ключом стоит только своих данных.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        """
+        :param key: ключ шифрования 16 байт
+        """
+        self.cipher = block_cipher(key)
+        self.tables = build_ghash_tables(self.cipher.encrypt_block(bytes(BLOCK_SIZE)))
+
+    def encryptor(self, nonce: bytes) -> GCMStream:
+        """Создаёт потоковый шифратор для одного сообщения."""
+        return GCMStream(self, nonce, decrypt=False)
+
+    def decryptor(self, nonce: bytes) -> GCMStream:
+        """Создаёт потоковый дешифратор для одного сообщения."""
+        return GCMStream(self, nonce, decrypt=True)
+
+    def encrypt(self, nonce: bytes, plaintext: bytes, aad: bytes = b"") -> Tuple[bytes, bytes]:
+        """
+        Шифрует сообщение целиком.
+
+        :return: пара (шифртекст, тег)
+        """
+        stream = self.encryptor(nonce)
+        stream.update_aad(aad)
+        ciphertext = stream.update(plaintext)
+        return ciphertext, stream.finalize()
+
+    def decrypt(self, nonce: bytes, ciphertext: bytes, tag: bytes, aad: bytes = b"") -> bytes:
+        """
+        Расшифровывает сообщение целиком и проверяет тег.
+
+        :raises ValueError: если тег не совпадает
+        """
+        stream = self.decryptor(nonce)
+        stream.update_aad(aad)
+        plaintext = stream.update(ciphertext)
+        stream.finalize(tag)
+        return plaintext
+
+
+if __name__ == '__main__':
+    example_key = bytes.fromhex('feffe9928665731c6d6a8f9467308308')
+    example_nonce = bytes.fromhex('cafebabefacedbaddecaf888')
+    example_aad = bytes.fromhex('feedfacedeadbeeffeedfacedeadbeefabaddad2')
+    message = bytes.fromhex(
+        'd9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72'
+        '1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39'
+    )
+
+    gcm = AESGCM(example_key)
+    encrypted, example_tag = gcm.encrypt(example_nonce, message, example_aad)
+    print(f'Шифртекст: {encrypted.hex()}')
+    print(f'Тег:       {example_tag.hex()}')
+    print(f'Проверка:  {gcm.decrypt(example_nonce, encrypted, example_tag, example_aad) == message}')
@@ -0,0 +1,442 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from aes_backend import block_cipher
+from aes_batch import encrypt_blocks
+from aes_gcm import AESGCM
+
+# Формат индекса — два файла.
+# Таблица токенов (открытая адресация, линейное пробирование), по слоту на различный токен:
+#   заголовок | MAGIC | версия | ёмкость | токенов | удалённых слотов | строк | записей в файле строк
+#   слоты     | токен 16 байт | номер первой записи цепочки + 1 (0 — пусто, TOMBSTONE — удалён)
+# Файл строк (путь + ROWS_SUFFIX) — массив записей цепочек, дописывается в конец:
+#   запись    | номер строки | номер следующей записи + 1 (0 — конец цепочки)
+MAGIC = b'AESX'
+VERSION = 2
+HEADER = struct.Struct('>4sB3xQQQQQ')
+SLOT = struct.Struct('<16sQ')
+SLOT_DTYPE = np.dtype([('token', np.uint8, 16), ('head', '<u8')])
+ENTRY = struct.Struct('<QQ')
+ENTRY_DTYPE = np.dtype([('row', '<u8'), ('next', '<u8')])
+EMPTY = 0
+TOMBSTONE = (1 << 64) - 1
+MAX_LOAD = 0.5      # доля занятых слотов (включая удалённые), после которой таблица растёт
+MIN_CAPACITY = 1 << 10
+ROWS_SUFFIX = '.rows'
+NONCE_SIZE = 12
+
+Value = Union[bytes, str]
+
+
+# ===== Токены и шифрование значений =====
+
+def _digest(value: Value) -> bytes:
+    """Сжатие значения произвольной длины до одного блока (SHA-256, первые 16 байт)."""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return hashlib.sha256(value).digest()[:16]
+
+
+def derive_token(token_key: bytes, value: Value) -> bytes:
+    """
+    Детерминированный токен значения: E_K(SHA-256(value)[:16]).
+
+    Равные значения дают равные токены, без ключа токен не вычислить.
+    """
+    return block_cipher(token_key).encrypt_block(_digest(value))
+
+
+def derive_tokens(token_key: bytes, values: Sequence[Value]) -> np.ndarray:
+    """
+    Токены для множества значений: хеши считаются подряд, а все блоки
+    шифруются одним векторизованным вызовом aes_batch.encrypt_blocks.
+
+    :return: массив токенов (N, 16); строка n совпадает с derive_token(token_key, values[n])
+    """
+    digests = np.frombuffer(b"".join(_digest(value) for value in values), dtype=np.uint8).reshape(-1, 16)
+    return encrypt_blocks(digests, token_key)
+
+
+def _gcm(data_key: Union[bytes, AESGCM]) -> AESGCM:
+    return data_key if isinstance(data_key, AESGCM) else AESGCM(data_key)
+
+
+def seal(data_key: Union[bytes, AESGCM], value: Value, token: bytes) -> bytes:
+    """
+    Шифрует значение для хранения рядом с токеном (AES-GCM, токен — AAD).
+
+    :param data_key: ключ 16 байт или контекст AESGCM; при шифровании многих
+                     значений лучше передавать контекст, чтобы таблицы GHASH
+                     строились один раз
+    :return: nonce || шифртекст || тег
+    """
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext, tag = _gcm(data_key).encrypt(nonce, value, token)
+    return nonce + ciphertext + tag
+
+
+def unseal(data_key: Union[bytes, AESGCM], sealed: bytes, token: bytes) -> bytes:
+    """
+    Расшифровывает значение, сохранённое seal().
+
+    :param data_key: ключ 16 байт или контекст AESGCM (см. seal)
+    :raises ValueError: если данные повреждены или относятся к другому токену
+    """
+    return _gcm(data_key).decrypt(sealed[:NONCE_SIZE], sealed[NONCE_SIZE:-16], sealed[-16:], token)
+
+
+# ===== Хеш-индекс на диске =====
+
+def _home_slots(tokens: np.ndarray, mask: int) -> np.ndarray:
+    """Начальные слоты: токены — выход AES, поэтому их младшие биты уже равномерны."""
+    return np.ascontiguousarray(tokens[:, :8]).view('<u8').reshape(-1) & np.uint64(mask)
+
+
+class SearchableIndex:
+    """
+    Индекс равенства по зашифрованным значениям: токен -> номера строк.
+
+    Таблица с открытой адресацией хранит по одному слоту на различный токен;
+    слот указывает на цепочку записей в файле строк. Оба файла отображаются
+    в память через mmap, поэтому поиск — O(1) обращений к слотам плюс по
+    одному обращению на найденную строку, без расшифрования записей, и
+    повторяющиеся значения не образуют кластеров в таблице. Массовая вставка
+    сводит токены к различным через np.unique и размещает слоты и цепочки
+    векторизованно; при заполнении больше MAX_LOAD таблица перестраивается
+    с удвоенной ёмкостью. Место удалённых записей в файле строк не
+    переиспользуется.
+    """
+
+    def __init__(self, path: str, token_key: bytes, capacity: int = MIN_CAPACITY) -> None:
+        """
+        :param path: путь к файлу таблицы (создаётся, если не существует);
+                     рядом хранится файл строк path + ROWS_SUFFIX
+        :param token_key: ключ токенов 16 байт
+        :param capacity: начальная ёмкость (округляется вверх до степени двойки)
+        """
+        self.path = path
+        self.rows_path = path + ROWS_SUFFIX
+        self.token_key = bytes(token_key)
+        self._cipher = block_cipher(self.token_key)
+        if not os.path.exists(path):
+            self._create(path, max(MIN_CAPACITY, 1 << (capacity - 1).bit_length()))
+            with open(self.rows_path, 'wb') as file:
+                file.truncate(MIN_CAPACITY * ENTRY.size)
+        self._open_table()
+        self._open_rows()
+
+    # --- файлы ---
+
+    @staticmethod
+    def _create(path: str, capacity: int) -> None:
+        """Создаёт пустую таблицу заданной ёмкости."""
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, capacity, 0, 0, 0, 0))
+            file.truncate(HEADER.size + capacity * SLOT.size)
+
+    def _open_table(self) -> None:
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        (magic, version, self.capacity, self.distinct, self.tombstones,
+         self.count, self.entries) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("Файл не является индексом токенов.")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия индекса: {version}.")
+        self._mask = self.capacity - 1
+
+    def _open_rows(self) -> None:
+        self._rows_file = open(self.rows_path, 'r+b')
+        self._rows_map = mmap.mmap(self._rows_file.fileno(), 0)
+        self._entry_capacity = len(self._rows_map) // ENTRY.size
+
+    def _close_table(self) -> None:
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    def _close_rows(self) -> None:
+        self._rows_map.flush()
+        self._rows_map.close()
+        self._rows_file.close()
+
+    def _write_header(self) -> None:
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, self.capacity, self.distinct, self.tombstones,
+                         self.count, self.entries)
+
+    def _table(self) -> np.ndarray:
+        """Слоты таблицы как массив NumPy поверх mmap (без копирования)."""
+        return np.frombuffer(self._map, dtype=SLOT_DTYPE, count=self.capacity, offset=HEADER.size)
+
+    def _entries(self) -> np.ndarray:
+        """Записи файла строк как массив NumPy поверх mmap (без копирования)."""
+        return np.frombuffer(self._rows_map, dtype=ENTRY_DTYPE, count=self._entry_capacity)
+
+    def _rebuild(self, capacity: int) -> None:
+        """Переносит живые слоты в новую таблицу ёмкости capacity (удалённые отбрасываются)."""
+        table = self._table()
+        live = (table['head'] != EMPTY) & (table['head'] != TOMBSTONE)
+        tokens, heads = table['token'][live].copy(), table['head'][live].copy()
+        del table
+        self._close_table()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        self._create(temp, capacity)
+        os.replace(temp, self.path)
+        count, entries = self.count, self.entries
+        self._open_table()
+        self.count, self.entries = count, entries
+        self._place(tokens, heads)
+
+    def _reserve(self, extra: int) -> None:
+        """Гарантирует место ещё для extra токенов при допустимой загрузке."""
+        if self.distinct + self.tombstones + extra <= self.capacity * MAX_LOAD:
+            return
+        capacity = self.capacity
+        while self.distinct + extra > capacity * MAX_LOAD:
+            capacity *= 2
+        self._rebuild(capacity)
+
+    def _reserve_entries(self, extra: int) -> None:
+        """Гарантирует место ещё для extra записей в файле строк (рост удвоением)."""
+        if self.entries + extra <= self._entry_capacity:
+            return
+        capacity = self._entry_capacity
+        while self.entries + extra > capacity:
+            capacity *= 2
+        self._rows_map.close()
+        self._rows_file.truncate(capacity * ENTRY.size)
+        self._rows_map = mmap.mmap(self._rows_file.fileno(), 0)
+        self._entry_capacity = capacity
+
+    # --- вставка ---
+
+    def _find(self, tokens: np.ndarray) -> np.ndarray:
+        """
+        Векторизованный поиск слотов различных токенов.
+
+        :return: номер слота для каждого токена или -1, если токена нет
+        """
+        table = self._table()
+        home = _home_slots(tokens, self._mask)
+        probe = np.zeros(len(tokens), dtype=np.uint64)
+        pending = np.arange(len(tokens))
+        found = np.full(len(tokens), -1, dtype=np.int64)
+        mask = np.uint64(self._mask)
+        while pending.size:
+            slots = (home[pending] + probe[pending]) & mask
+            head = table['head'][slots]
+            hit = ((head != EMPTY) & (head != TOMBSTONE)
+                   & (table['token'][slots] == tokens[pending]).all(axis=1))
+            found[pending[hit]] = slots[hit]
+            pending = pending[(head != EMPTY) & ~hit]
+            probe[pending] += np.uint64(1)
+        return found
+
+    def _place(self, tokens: np.ndarray, heads: np.ndarray) -> None:
+        """
+        Векторизованное размещение новых различных токенов: на каждом шаге все
+        ещё не размещённые токены пробуют следующий слот, из претендентов на
+        свободный слот побеждает первый.
+        """
+        table = self._table()
+        home = _home_slots(tokens, self._mask)
+        probe = np.zeros(len(tokens), dtype=np.uint64)
+        pending = np.arange(len(tokens))
+        mask = np.uint64(self._mask)
+        while pending.size:
+            slots = (home[pending] + probe[pending]) & mask
+            occupant = table['head'][slots]
+            free = (occupant == EMPTY) | (occupant == TOMBSTONE)
+            free_slots, first = np.unique(slots[free], return_index=True)
+            winners = pending[free][first]
+            self.tombstones -= int(np.count_nonzero(table['head'][free_slots] == TOMBSTONE))
+            table['token'][free_slots] = tokens[winners]
+            table['head'][free_slots] = heads[winners]
+
+            placed = np.zeros(len(tokens), dtype=bool)
+            placed[winners] = True
+            pending = pending[~placed[pending]]
+            probe[pending] += np.uint64(1)
+        self.distinct += len(tokens)
+        del table
+        self._write_header()
+
+    def bulk_insert(self, rows: Sequence[int], values: Sequence[Value]) -> None:
+        """
+        Добавляет множество строк. Повторяющиеся значения сводятся к
+        различным до шифрования, так что AES и поиск слота выполняются по
+        разу на значение; строки каждого значения записываются в файл строк
+        одной цепочкой перед уже имевшимися.
+
+        :param rows: номера строк (0 <= row < 2^64)
+        :param values: значения строк в том же порядке
+        """
+        if len(rows) != len(values):
+            raise ValueError("Количество строк должно совпадать с количеством значений.")
+        if not len(rows):
+            return
+        rows = np.asarray(rows, dtype=np.uint64)
+        digests = np.frombuffer(b"".join(_digest(value) for value in values), dtype=np.uint8).reshape(-1, 16)
+        unique, inverse = np.unique(digests.view('V16').reshape(-1), return_inverse=True)
+        inverse = inverse.reshape(-1)
+        tokens = encrypt_blocks(unique.view(np.uint8).reshape(-1, 16), self.token_key)
+
+        self._reserve(len(tokens))
+        self._reserve_entries(len(rows))
+        slots = self._find(tokens)
+        exists = slots >= 0
+
+        # Новые записи группируются по токену: внутри группы каждая ссылается
+        # на следующую, последняя — на прежнее начало цепочки токена
+        order = np.argsort(inverse, kind='stable')
+        group = inverse[order]
+        counts = np.bincount(inverse, minlength=len(tokens))
+        base = self.entries
+        heads = (np.cumsum(counts) - counts).astype(np.uint64) + np.uint64(base + 1)
+        table = self._table()
+        old_heads = np.zeros(len(tokens), dtype=np.uint64)
+        old_heads[exists] = table['head'][slots[exists]]
+        links = np.arange(base + 2, base + 2 + len(rows), dtype=np.uint64)
+        last = np.append(group[1:] != group[:-1], True)
+        links[last] = old_heads[group[last]]
+
+        entries = self._entries()
+        entries['row'][base:base + len(rows)] = rows[order]
+        entries['next'][base:base + len(rows)] = links
+        table['head'][slots[exists]] = heads[exists]
+        del table, entries
+        self.entries += len(rows)
+        self.count += len(rows)
+        self._place(tokens[~exists], heads[~exists])
+
+    def _probe(self, token: bytes) -> Tuple[Optional[int], int]:
+        """
+        Поиск слота токена.
+
+        :return: (смещение слота с этим токеном или None, смещение слота для вставки)
+        """
+        slot = int.from_bytes(token[:8], 'little') & self._mask
+        free = None
+        while True:
+            offset = HEADER.size + slot * SLOT.size
+            stored, head = SLOT.unpack_from(self._map, offset)
+            if head == EMPTY:
+                return None, offset if free is None else free
+            if head == TOMBSTONE:
+                free = offset if free is None else free
+            elif stored == token:
+                return offset, offset
+            slot = (slot + 1) & self._mask
+
+    def insert(self, row: int, value: Value) -> None:
+        """Добавляет одну строку."""
+        token = self._cipher.encrypt_block(_digest(value))
+        self._reserve(1)
+        self._reserve_entries(1)
+        offset, free = self._probe(token)
+        if offset is None:
+            _, occupant = SLOT.unpack_from(self._map, free)
+            self.tombstones -= occupant == TOMBSTONE
+            self.distinct += 1
+            offset, head = free, EMPTY
+        else:
+            _, head = SLOT.unpack_from(self._map, offset)
+        ENTRY.pack_into(self._rows_map, self.entries * ENTRY.size, row, head)
+        self.entries += 1
+        SLOT.pack_into(self._map, offset, token, self.entries)
+        self.count += 1
+        self._write_header()
+
+    # --- поиск и удаление ---
+
+    def lookup(self, value: Value) -> List[int]:
+        """
+        Номера строк, значение которых равно value.
+
+        :return: список номеров строк (пустой, если совпадений нет)
+        """
+        offset, _ = self._probe(self._cipher.encrypt_block(_digest(value)))
+        if offset is None:
+            return []
+        _, entry = SLOT.unpack_from(self._map, offset)
+        rows = []
+        while entry != EMPTY:
+            row, entry = ENTRY.unpack_from(self._rows_map, (entry - 1) * ENTRY.size)
+            rows.append(row)
+        return rows
+
+    def delete(self, row: int, value: Value) -> bool:
+        """
+        Удаляет строку из индекса: запись исключается из цепочки, слот без
+        строк помечается удалённым.
+
+        :return: True, если строка была найдена
+        """
+        token = self._cipher.encrypt_block(_digest(value))
+        offset, _ = self._probe(token)
+        if offset is None:
+            return False
+        _, entry = SLOT.unpack_from(self._map, offset)
+        previous = None
+        while entry != EMPTY:
+            stored, following = ENTRY.unpack_from(self._rows_map, (entry - 1) * ENTRY.size)
+            if stored == row:
+                if previous is not None:
+                    ENTRY.pack_into(self._rows_map, (previous[0] - 1) * ENTRY.size, previous[1], following)
+                elif following != EMPTY:
+                    SLOT.pack_into(self._map, offset, token, following)
+                else:
+                    SLOT.pack_into(self._map, offset, token, TOMBSTONE)
+                    self.distinct -= 1
+                    self.tombstones += 1
+                self.count -= 1
+                self._write_header()
+                return True
+            previous = (entry, stored)
+            entry = following
+        return False
+
+    def __len__(self) -> int:
+        return self.count
+
+    def flush(self) -> None:
+        """Сбрасывает изменения на диск."""
+        self._rows_map.flush()
+        self._map.flush()
+
+    def close(self) -> None:
+        """Сбрасывает изменения и закрывает файлы индекса."""
+        self._close_rows()
+        self._close_table()
+
+    def __enter__(self) -> 'SearchableIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    example_token_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    example_gcm = AESGCM(os.urandom(16))
+    cities = ['Москва', 'Казань', 'Тверь', 'Москва', 'Омск'] * 20_000
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with SearchableIndex(os.path.join(workdir, 'city.idx'), example_token_key) as index:
+            index.bulk_insert(range(len(cities)), cities)
+            index.delete(0, 'Москва')
+            token = derive_token(example_token_key, cities[2])
+            sealed = seal(example_gcm, cities[2], token)
+            print(f"Строк с городом 'Тверь': {len(index.lookup('Тверь'))}, "
+                  f"'Москва': {len(index.lookup('Москва'))}, запись: {unseal(example_gcm, sealed, token).decode()}")
@@ -0,0 +1,184 @@
+import os
+import sys
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Sequence, Union
+
+import numpy as np
+
+from aes import decrypt_block_words, encrypt_block_words
+from aes_batch import BlocksLike, as_blocks, batch_key_expansion, decrypt_array, encrypt_array, inv_mix_columns
+
+SLAB_SIZE = 176  # 11 раундовых ключей по 16 байт
+
+
+class KeyStore:
+    """
+    Компактное хранилище расписаний ключей AES-128 для множества сессий.
+
+    Все расширенные ключи лежат в одном массиве NumPy (capacity, 176) uint8,
+    рядом — массив той же формы с расписаниями эквивалентного обратного
+    шифра; сессия адресует свой слот через словарь session_id -> номер слота.
+    Оба расписания вычисляются векторизованно при добавлении ключей, и
+    шифрование выполняется прямо из массивов: одиночный блок — через
+    T-табличный движок по 44 словам слота, пачка блоков разных сессий —
+    векторизованно через encrypt_array с ключом на каждый блок.
+
+    При заполнении хранилища вытесняется сессия, к которой дольше всего не
+    обращались (LRU), либо, при evict=False, возбуждается исключение.
+    """
+
+    def __init__(self, capacity: int, evict: bool = True) -> None:
+        """
+        :param capacity: максимальное число одновременно хранимых сессий
+        :param evict: вытеснять ли самую старую сессию при заполнении
+        """
+        if capacity <= 0:
+            raise ValueError("Ёмкость хранилища должна быть положительной.")
+        self.capacity = capacity
+        self.evict = evict
+        self.evictions = 0
+        self._slabs = np.zeros((capacity, SLAB_SIZE), dtype=np.uint8)
+        self._words = self._slabs.view('>u4')  # те же байты как 44 слова на слот
+        self._inv_slabs = np.zeros((capacity, SLAB_SIZE), dtype=np.uint8)
+        self._inv_words = self._inv_slabs.view('>u4')
+        self._slots: 'OrderedDict[Hashable, int]' = OrderedDict()
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    # --- управление сессиями ---
+
+    def _take_slot(self) -> int:
+        """Свободный слот; при необходимости вытесняет самую старую сессию."""
+        if self._free:
+            return self._free.pop()
+        if not self.evict:
+            raise ValueError("Хранилище ключей заполнено.")
+        _, slot = self._slots.popitem(last=False)
+        self.evictions += 1
+        return slot
+
+    def add_many(self, session_ids: Sequence[Hashable], keys: Union[BlocksLike, Iterable[bytes]]) -> None:
+        """
+        Добавляет (или заменяет) ключи нескольких сессий; расписания
+        вычисляются одним вызовом batch_key_expansion.
+
+        :param session_ids: идентификаторы сессий
+        :param keys: ключи по 16 байт в том же порядке
+        :raises ValueError: если длина какого-либо ключа не равна 16 байтам
+        """
+        if not isinstance(keys, np.ndarray):
+            keys = [bytes(key) for key in keys]
+            if any(len(key) != 16 for key in keys):
+                raise ValueError("Длина ключа должна быть 16 байт.")
+        schedules = batch_key_expansion(keys)
+        if len(schedules) != len(session_ids):
+            raise ValueError("Количество ключей должно совпадать с количеством сессий.")
+        # Эквивалентный обратный шифр: ключи в обратном порядке, к раундам 1..9 — InvMixColumns
+        inverse = schedules[:, ::-1].copy()
+        inverse[:, 1:10] = inv_mix_columns(inverse[:, 1:10].reshape(-1, 16)).reshape(-1, 9, 16)
+        for session_id, schedule, inverse_schedule in zip(session_ids, schedules.reshape(-1, SLAB_SIZE),
+                                                          inverse.reshape(-1, SLAB_SIZE)):
+            slot = self._slots.pop(session_id, None)
+            if slot is None:
+                slot = self._take_slot()
+            self._slots[session_id] = slot
+            self._slabs[slot] = schedule
+            self._inv_slabs[slot] = inverse_schedule
+
+    def add(self, session_id: Hashable, key: bytes) -> None:
+        """Добавляет (или заменяет) ключ сессии."""
+        self.add_many([session_id], [key])
+
+    def remove(self, session_id: Hashable) -> None:
+        """Удаляет сессию и обнуляет её слот."""
+        slot = self._slots.pop(session_id)
+        self._slabs[slot] = 0
+        self._inv_slabs[slot] = 0
+        self._free.append(slot)
+
+    def _slot(self, session_id: Hashable) -> int:
+        """Слот сессии с отметкой об обращении (для LRU)."""
+        try:
+            self._slots.move_to_end(session_id)
+        except KeyError:
+            raise KeyError(f"Неизвестная сессия: {session_id!r}") from None
+        return self._slots[session_id]
+
+    def schedule(self, session_id: Hashable) -> memoryview:
+        """Расписание ключа сессии: 176 байт без копирования."""
+        return memoryview(self._slabs[self._slot(session_id)])
+
+    def __contains__(self, session_id: Hashable) -> bool:
+        return session_id in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # --- шифрование ---
+
+    def encrypt_block(self, session_id: Hashable, block: bytes) -> bytes:
+        """Шифрует один блок 16 байт ключом сессии."""
+        if len(block) != 16:
+            raise ValueError("Длина открытого текста должна быть 16 байт.")
+        return encrypt_block_words(block, self._words[self._slot(session_id)].tolist())
+
+    def decrypt_block(self, session_id: Hashable, block: bytes) -> bytes:
+        """Расшифровывает один блок 16 байт ключом сессии (готовое обратное расписание)."""
+        if len(block) != 16:
+            raise ValueError("Длина зашифрованного текста должна быть 16 байт.")
+        return decrypt_block_words(block, self._inv_words[self._slot(session_id)].tolist())
+
+    def _batch_keys(self, session_ids: Sequence[Hashable]) -> np.ndarray:
+        """Раундовые ключи (N, 11, 16) для пачки блоков."""
+        slots = np.fromiter((self._slot(session_id) for session_id in session_ids), dtype=np.intp,
+                            count=len(session_ids))
+        return self._slabs[slots].reshape(-1, 11, 16)
+
+    def encrypt_batch(self, session_ids: Sequence[Hashable], blocks: BlocksLike) -> np.ndarray:
+        """
+        Шифрует пачку блоков разных сессий за один векторизованный проход.
+
+        :param session_ids: сессия для каждого блока
+        :param blocks: блоки (N, 16) или байты длиной 16·N
+        :return: шифртексты (N, 16)
+        """
+        state = as_blocks(blocks)
+        if len(state) != len(session_ids):
+            raise ValueError("Количество блоков должно совпадать с количеством сессий.")
+        return encrypt_array(state, self._batch_keys(session_ids))
+
+    def decrypt_batch(self, session_ids: Sequence[Hashable], blocks: BlocksLike) -> np.ndarray:
+        """Расшифровывает пачку блоков разных сессий (см. encrypt_batch)."""
+        state = as_blocks(blocks)
+        if len(state) != len(session_ids):
+            raise ValueError("Количество блоков должно совпадать с количеством сессий.")
+        return decrypt_array(state, self._batch_keys(session_ids))
+
+    # --- учёт памяти ---
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Оценка занимаемой памяти.
+
+        :return: словарь с ёмкостью, числом сессий, числом вытеснений, байтами
+                 массивов прямых и обратных расписаний (выделено/занято) и
+                 оценкой накладных расходов индекса сессий
+        """
+        index = sys.getsizeof(self._slots) + sys.getsizeof(self._free) + 8 * len(self._free)
+        return {
+            'capacity': self.capacity,
+            'sessions': len(self._slots),
+            'evictions': self.evictions,
+            'slab_bytes': self._slabs.nbytes + self._inv_slabs.nbytes,
+            'used_bytes': len(self._slots) * 2 * SLAB_SIZE,
+            'index_bytes': index,
+        }
+
+
+if __name__ == '__main__':
+    store = KeyStore(capacity=100_000)
+    session_keys = [os.urandom(16) for _ in range(120_000)]
+    store.add_many(list(range(len(session_keys))), session_keys)
+
+    example_block = bytes.fromhex('3243f6a8885a308d313198a2e0370734')
+    print(f'Сессия 119999: {store.encrypt_block(119_999, example_block).hex()}')
+    print(store.memory_usage())
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict
+
+from aes_backend import block_cipher
+from aes_modes import xor_bytes
+
+BLOCK_SIZE = 16
+
+
+class KeystreamBuffer:
+    """
+    Буфер заранее вычисленной гаммы AES-CTR/OFB.
+
+    Фоновый поток генерирует гамму порциями по chunk_blocks блоков в кольцевой
+    буфер глубиной depth порций. На пути запроса остаётся только XOR с уже
+    готовыми байтами; если буфер пуст, порция вычисляется синхронно. Счётчики
+    hits/misses показывают, сколько порций было взято из буфера и сколько
+    пришлось вычислять на месте.
+    """
+
+    def __init__(self, key: bytes, iv: bytes, mode: str = 'CTR', depth: int = 8,
+                 chunk_blocks: int = 64, prefetch: bool = True) -> None:
+        """
+        :param key: ключ шифрования 16 байт
+        :param iv: начальный блок счётчика (CTR) или вектор инициализации (OFB), 16 байт
+        :param mode: 'CTR' или 'OFB'
+        :param depth: глубина кольцевого буфера в порциях
+        :param chunk_blocks: размер порции в блоках
+        :param prefetch: запускать ли фоновый поток
+        """
+        mode = mode.upper()
+        if mode not in ('CTR', 'OFB'):
+            raise ValueError("Буфер гаммы поддерживает только режимы CTR и OFB.")
+        if len(iv) != BLOCK_SIZE:
+            raise ValueError("Длина вектора инициализации должна быть 16 байт.")
+        if depth < 1 or chunk_blocks < 1:
+            raise ValueError("Глубина буфера и размер порции должны быть положительными.")
+
+        self.mode = mode
+        self.depth = depth
+        self.chunk_blocks = chunk_blocks
+        self.hits = 0
+        self.misses = 0
+
+        self._cipher = block_cipher(key)
+        self._register = bytes(iv)
+        self._ready: Deque[bytes] = deque()
+        self._current = b""             # неиспользованный остаток текущей порции
+        self._gen_lock = threading.Lock()  # порции генерируются и кладутся в буфер строго по порядку
+        self._space = threading.Condition()
+        self._closed = False
+        self._worker = None
+        if prefetch:
+            self._worker = threading.Thread(target=self._run, name='aes-keystream', daemon=True)
+            self._worker.start()
+
+    # --- генерация ---
+
+    def _generate(self) -> bytes:
+        """Вычисляет следующую порцию гаммы (вызывается под _gen_lock)."""
+        n = self.chunk_blocks
+        if self.mode == 'CTR':
+            start = int.from_bytes(self._register, 'big')
+            counters = b"".join(((start + i) % (1 << 128)).to_bytes(BLOCK_SIZE, 'big') for i in range(n))
+            self._register = ((start + n) % (1 << 128)).to_bytes(BLOCK_SIZE, 'big')
+            return self._cipher.encrypt_blocks(counters)
+
+        parts = []
+        register = self._register
+        for _ in range(n):
+            register = self._cipher.encrypt_block(register)
+            parts.append(register)
+        self._register = register
+        return b"".join(parts)
+
+    def _run(self) -> None:
+        """Цикл фонового потока: заполняет буфер, пока в нём есть место."""
+        while True:
+            with self._space:
+                while not self._closed and len(self._ready) >= self.depth:
+                    self._space.wait()
+                if self._closed:
+                    return
+            with self._gen_lock:
+                self._ready.append(self._generate())
+
+    def _next_chunk(self) -> bytes:
+        """Берёт следующую порцию из буфера или вычисляет её синхронно."""
+        try:
+            chunk = self._ready.popleft()
+            self.hits += 1
+        except IndexError:
+            with self._gen_lock:
+                # Пока ждали блокировку, фоновый поток мог успеть положить порцию
+                if self._ready:
+                    chunk = self._ready.popleft()
+                    self.hits += 1
+                else:
+                    chunk = self._generate()
+                    self.misses += 1
+        with self._space:
+            self._space.notify()
+        return chunk
+
+    # --- публичный интерфейс ---
+
+    def keystream(self, length: int) -> bytes:
+        """
+        Возвращает следующие length байт гаммы.
+
+        :param length: количество байт
+        :return: гамма
+        """
+        parts = [self._current]
+        have = len(self._current)
+        while have < length:
+            chunk = self._next_chunk()
+            parts.append(chunk)
+            have += len(chunk)
+        stream = b"".join(parts)
+        self._current = stream[length:]
+        return stream[:length]
+
+    def process(self, data: bytes) -> bytes:
+        """
+        Шифрует или расшифровывает данные (XOR с гаммой).
+
+        :param data: данные произвольной длины
+        :return: результат той же длины
+        """
+        return xor_bytes(data, self.keystream(len(data)))
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики попаданий и промахов буфера и текущая заполненность."""
+        return {'hits': self.hits, 'misses': self.misses, 'buffered': len(self._ready)}
+
+    def close(self) -> None:
+        """Останавливает фоновый поток."""
+        with self._space:
+            self._closed = True
+            self._space.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+
+    def __enter__(self) -> 'KeystreamBuffer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    example_iv = bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff')
+
+    with KeystreamBuffer(example_key, example_iv, depth=16) as buffer:
+        time.sleep(0.1)  # даём фоновому потоку заполнить буфер
+        for _ in range(200):
+            buffer.process(b'packet payload of some 64 bytes' * 2)
+        print(buffer.stats())
@@ -0,0 +1,304 @@
+import hmac
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from aes_backend import block_cipher
+
+BLOCK_SIZE = 16
+MASK_128 = (1 << 128) - 1
+SEGMENT_SIZE = 1 << 24  # размер задачи для процесса при параллельном PMAC, байт
+BATCH_BLOCKS = 4096     # сколько блоков PMAC обрабатывается одним пакетным вызовом
+
+
+# ===== Арифметика GF(2^128) =====
+
+def dbl(x: int) -> int:
+    """Умножение на x в GF(2^128) (порядок big-endian, многочлен x^128 + x^7 + x^2 + x + 1)."""
+    return ((x << 1) & MASK_128) ^ (0x87 if x >> 127 else 0)
+
+
+def half(x: int) -> int:
+    """Деление на x в GF(2^128) — обратная операция к dbl."""
+    return (x >> 1) ^ ((1 << 127) | 0x43) if x & 1 else x >> 1
+
+
+def fold_xor(data: bytes) -> int:
+    """
+    XOR всех 16-байтовых блоков данных.
+
+    Данные как одно длинное число складываются пополам, пока не останется
+    один блок: O(log N) операций интерпретатора вместо N.
+    """
+    n = len(data) // BLOCK_SIZE
+    x = int.from_bytes(data, 'big')
+    acc = 0
+    while n > 1:
+        if n % 2:
+            acc ^= x & MASK_128
+            x >>= 128
+            n -= 1
+        n //= 2
+        x = (x >> (128 * n)) ^ (x & ((1 << (128 * n)) - 1))
+    return acc ^ x
+
+
+# ===== CMAC =====
+
+def cmac_subkeys(cipher) -> Tuple[int, int]:
+    """
+    Подключи K1, K2 для CMAC.
+
+    :param cipher: блочный шифр с методом encrypt_block
+    :return: (K1, K2)
+    """
+    k1 = dbl(int.from_bytes(cipher.encrypt_block(bytes(BLOCK_SIZE)), 'big'))
+    return k1, dbl(k1)
+
+
+class CMAC:
+    """
+    Потоковый AES-CMAC (NIST SP 800-38B).
+
+    Блочный шифр и подключи вычисляются один раз при создании объекта,
+    между вызовами update() хранится не больше одного блока.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        """
+        :param key: ключ 16 байт
+        """
+        self._cipher = block_cipher(bytes(key))
+        self._k1, self._k2 = cmac_subkeys(self._cipher)
+        self._state = 0
+        self._buffer = b""  # последний (возможно полный) блок придерживается до finalize()
+        self._finalized = False
+
+    def update(self, data: bytes) -> None:
+        """Добавляет порцию данных."""
+        if self._finalized:
+            raise ValueError("CMAC уже завершён.")
+        buffer = self._buffer + bytes(data)
+        # Оставляем хотя бы один байт: последний блок обрабатывается особо
+        ready = (len(buffer) - 1) // BLOCK_SIZE * BLOCK_SIZE if buffer else 0
+        encrypt = self._cipher.encrypt_block
+        state = self._state
+        for i in range(0, ready, BLOCK_SIZE):
+            block = state ^ int.from_bytes(buffer[i:i + BLOCK_SIZE], 'big')
+            state = int.from_bytes(encrypt(block.to_bytes(BLOCK_SIZE, 'big')), 'big')
+        self._state = state
+        self._buffer = buffer[ready:]
+
+    def finalize(self) -> bytes:
+        """
+        Завершает вычисление.
+
+        :return: тег 16 байт
+        """
+        if self._finalized:
+            raise ValueError("CMAC уже завершён.")
+        self._finalized = True
+        last = self._buffer
+        if len(last) == BLOCK_SIZE:
+            block = int.from_bytes(last, 'big') ^ self._k1
+        else:
+            padded = last + b"\x80" + bytes(BLOCK_SIZE - len(last) - 1)
+            block = int.from_bytes(padded, 'big') ^ self._k2
+        return self._cipher.encrypt_block((self._state ^ block).to_bytes(BLOCK_SIZE, 'big'))
+
+    def verify(self, tag: bytes) -> None:
+        """
+        Завершает вычисление и сверяет тег.
+
+        :raises ValueError: если тег не совпадает
+        """
+        if not hmac.compare_digest(self.finalize(), tag):
+            raise ValueError("Ошибка аутентификации: тег не совпадает.")
+
+
+def cmac(key: bytes, data: bytes) -> bytes:
+    """CMAC сообщения целиком."""
+    mac = CMAC(key)
+    mac.update(data)
+    return mac.finalize()
+
+
+# ===== PMAC =====
+
+def pmac_offsets(cipher) -> Tuple[List[int], int]:
+    """
+    Таблица смещений PMAC.
+
+    :param cipher: блочный шифр с методом encrypt_block
+    :return: (L(i) = L·x^i для i < 64, L(-1) = L·x^-1), где L = E_K(0)
+    """
+    l0 = int.from_bytes(cipher.encrypt_block(bytes(BLOCK_SIZE)), 'big')
+    table = [l0]
+    for _ in range(63):
+        table.append(dbl(table[-1]))
+    return table, half(l0)
+
+
+def pmac_offset(table: List[int], index: int) -> int:
+    """
+    Смещение блока номер index (с 1) без последовательного пересчёта.
+
+    Δ_i = XOR L(k) по битам k кода Грея числа i, поэтому любой блок
+    (и любой сегмент сообщения) можно обработать независимо.
+    """
+    gray = index ^ (index >> 1)
+    offset = 0
+    k = 0
+    while gray:
+        if gray & 1:
+            offset ^= table[k]
+        gray >>= 1
+        k += 1
+    return offset
+
+
+def pmac_segment(cipher, table: List[int], data: bytes, first_index: int) -> int:
+    """
+    Частичная сумма Σ E_K(M_i ^ Δ_i) для непрерывного набора целых блоков.
+
+    Смещения накладываются одним XOR длинных чисел, а все блоки шифруются
+    одним вызовом encrypt_blocks, поэтому работа пакетная.
+
+    :param cipher: блочный шифр с методом encrypt_blocks
+    :param table: таблица L(i) из pmac_offsets
+    :param data: целое число блоков (без последнего блока сообщения)
+    :param first_index: номер первого блока (с 1)
+    :return: XOR зашифрованных блоков как 128-битное число
+    """
+    total = 0
+    step = BATCH_BLOCKS * BLOCK_SIZE
+    for start in range(0, len(data), step):
+        chunk = data[start:start + step]
+        index = first_index + start // BLOCK_SIZE
+        offset = pmac_offset(table, index)
+        offsets = [offset]
+        for i in range(index + 1, index + len(chunk) // BLOCK_SIZE):
+            offset ^= table[(i & -i).bit_length() - 1]  # Δ_i = Δ_{i-1} ^ L(ntz(i))
+            offsets.append(offset)
+        masks = b"".join(o.to_bytes(BLOCK_SIZE, 'big') for o in offsets)
+        masked = (int.from_bytes(chunk, 'big') ^ int.from_bytes(masks, 'big')).to_bytes(len(chunk), 'big')
+        total ^= fold_xor(cipher.encrypt_blocks(masked))
+    return total
+
+
+def pmac_finish(cipher, l_inv: int, total: int, last: bytes) -> bytes:
+    """Обработка последнего блока и вычисление тега PMAC."""
+    if len(last) == BLOCK_SIZE:
+        total ^= int.from_bytes(last, 'big') ^ l_inv
+    else:
+        total ^= int.from_bytes(last + b"\x80" + bytes(BLOCK_SIZE - len(last) - 1), 'big')
+    return cipher.encrypt_block(total.to_bytes(BLOCK_SIZE, 'big'))
+
+
+class PMAC:
+    """
+    Потоковый PMAC (конструкция PMAC1 Рогауэя) на AES.
+
+    В отличие от CMAC, блоки не связаны цепочкой: смещение каждого блока
+    вычисляется по его номеру, так что блоки обрабатываются пакетами,
+    а большие файлы — параллельно в нескольких процессах (pmac_file).
+    """
+
+    def __init__(self, key: bytes) -> None:
+        """
+        :param key: ключ 16 байт
+        """
+        self.key = bytes(key)
+        self._cipher = block_cipher(self.key)
+        self._table, self._l_inv = pmac_offsets(self._cipher)
+        self._total = 0
+        self._index = 1
+        self._buffer = b""
+        self._finalized = False
+
+    def update(self, data: bytes) -> None:
+        """Добавляет порцию данных."""
+        if self._finalized:
+            raise ValueError("PMAC уже завершён.")
+        buffer = self._buffer + bytes(data)
+        ready = (len(buffer) - 1) // BLOCK_SIZE * BLOCK_SIZE if buffer else 0
+        if ready:
+            self._total ^= pmac_segment(self._cipher, self._table, buffer[:ready], self._index)
+            self._index += ready // BLOCK_SIZE
+        self._buffer = buffer[ready:]
+
+    def finalize(self) -> bytes:
+        """
+        Завершает вычисление.
+
+        :return: тег 16 байт
+        """
+        if self._finalized:
+            raise ValueError("PMAC уже завершён.")
+        self._finalized = True
+        return pmac_finish(self._cipher, self._l_inv, self._total, self._buffer)
+
+
+def pmac(key: bytes, data: bytes) -> bytes:
+    """PMAC сообщения целиком."""
+    mac = PMAC(key)
+    mac.update(data)
+    return mac.finalize()
+
+
+def _pmac_file_segment(task: Tuple[bytes, str, int, int]) -> int:
+    """Задача процесса: частичная сумма PMAC для диапазона байт файла."""
+    key, path, start, end = task
+    cipher = block_cipher(key)
+    table, _ = pmac_offsets(cipher)
+    total = 0
+    step = BATCH_BLOCKS * BLOCK_SIZE
+    with open(path, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            chunk = file.read(min(step, end - position))
+            total ^= pmac_segment(cipher, table, chunk, position // BLOCK_SIZE + 1)
+            position += len(chunk)
+    return total
+
+
+def pmac_file(key: bytes, path: str, workers: Optional[int] = None, segment_size: int = SEGMENT_SIZE) -> bytes:
+    """
+    PMAC файла с распределением блоков по процессам.
+
+    Каждый процесс сам читает свой диапазон файла, поэтому данные не
+    передаются между процессами; результаты объединяются XOR.
+
+    :param key: ключ 16 байт
+    :param path: путь к файлу
+    :param workers: число процессов (None — по числу ядер)
+    :param segment_size: размер диапазона одной задачи в байтах (кратен 16)
+    :return: тег 16 байт (совпадает с pmac(key, содержимое файла))
+    :raises ValueError: если segment_size не кратен 16 байтам
+    """
+    if segment_size <= 0 or segment_size % BLOCK_SIZE != 0:
+        raise ValueError("Размер сегмента должен быть положительным и кратным 16 байтам.")
+    size = os.path.getsize(path)
+    body = (size - 1) // BLOCK_SIZE * BLOCK_SIZE if size else 0
+    tasks = [(bytes(key), path, start, min(start + segment_size, body)) for start in range(0, body, segment_size)]
+
+    total = 0
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(_pmac_file_segment, tasks):
+                total ^= partial
+    with open(path, 'rb') as file:
+        file.seek(body)
+        last = file.read()
+    cipher = block_cipher(bytes(key))
+    return pmac_finish(cipher, pmac_offsets(cipher)[1], total, last)
+
+
+if __name__ == '__main__':
+    # Пример 2 из NIST SP 800-38B (AES-128)
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    message = bytes.fromhex('6bc1bee22e409f96e93d7e117393172a')
+
+    print(f'CMAC: {cmac(example_key, message).hex()}')
+    print(f'PMAC: {pmac(example_key, message).hex()}')
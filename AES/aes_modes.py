@@ -0,0 +1,246 @@
+from typing import BinaryIO, Optional
+
+from aes_backend import get_backend
+
+BLOCK_SIZE = 16
+MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR')
+# Режимы, в которых данные обрабатываются целыми блоками и нужен паддинг
+PADDED_MODES = ('ECB', 'CBC')
+
+
+# ===== Вспомогательные функции =====
+
+def xor_bytes(a: bytes, b: bytes) -> bytes:
+    """XOR двух байтовых строк одинаковой длины через длинное целое."""
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+def pkcs7_pad(data: bytes, block_size: int = BLOCK_SIZE) -> bytes:
+    """PKCS#7 padding."""
+    pad_len = block_size - len(data) % block_size
+    return data + bytes([pad_len] * pad_len)
+
+
+def pkcs7_unpad(data: bytes, block_size: int = BLOCK_SIZE) -> bytes:
+    """
+    Удаляет PKCS#7 padding.
+
+    :raises ValueError: если паддинг некорректен
+    """
+    if not data or len(data) % block_size != 0:
+        raise ValueError("Invalid padding")
+    pad_len = data[-1]
+    if pad_len < 1 or pad_len > block_size or data[-pad_len:] != bytes([pad_len] * pad_len):
+        raise ValueError("Invalid padding")
+    return data[:-pad_len]
+
+
+# ===== Потоковый шифратор =====
+
+class StreamingCipher:
+    """
+    Потоковый шифратор/дешифратор AES-128 в режимах ECB, CBC, CFB, OFB и CTR.
+
+    Блочные операции и сами режимы выполняет текущий бэкенд (aes_backend):
+    при наличии pycryptodome — нативно, иначе — на чистом Python.
+
+    Данные подаются порциями через update(), остаток обрабатывается в finalize().
+    Между вызовами хранится не больше одного-двух блоков, поэтому расход памяти
+    не зависит от размера входа. ECB и CBC используют PKCS#7 (если padding=True),
+    CFB (128-битный), OFB и CTR работают как потоковые и паддинга не требуют.
+    """
+
+    def __init__(self, key: bytes, mode: str, iv: Optional[bytes] = None,
+                 decrypt: bool = False, padding: bool = True) -> None:
+        """
+        :param key: ключ шифрования 16 байт
+        :param mode: один из MODES
+        :param iv: вектор инициализации 16 байт (для CTR — начальный блок счётчика);
+                   не используется в ECB
+        :param decrypt: True — расшифрование, False — шифрование
+        :param padding: использовать PKCS#7 в режимах ECB и CBC
+        :raises ValueError: если режим неизвестен или длина iv некорректна
+        """
+        mode = mode.upper()
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим {mode!r}, ожидается один из {MODES}.")
+        if mode == 'ECB':
+            iv = bytes(BLOCK_SIZE)
+        elif iv is None or len(iv) != BLOCK_SIZE:
+            raise ValueError("Длина вектора инициализации должна быть 16 байт.")
+
+        self.mode = mode
+        self.decrypt = decrypt
+        self.padding = padding and mode in PADDED_MODES
+        backend = get_backend()
+        self._cipher = backend.block_cipher(key)
+        self._native = backend.mode_cipher(key, mode, iv, decrypt)  # None для чистого Python
+        self._register = bytes(iv)      # CBC/CFB: предыдущий блок шифртекста; OFB: гамма; CTR: счётчик
+        self._buffer = b""              # ECB/CBC: необработанный хвост
+        self._keystream = b""           # CFB/OFB/CTR: неиспользованный остаток гаммы
+        self._feedback = b""            # CFB: накопленная часть текущего блока шифртекста
+        self._finalized = False
+
+    # --- блочные режимы ---
+
+    def _process_blocks(self, data: bytes) -> bytes:
+        """Обрабатывает целое число блоков в режиме ECB или CBC."""
+        if self._native is not None:
+            return self._native.decrypt(data) if self.decrypt else self._native.encrypt(data)
+        view = memoryview(data)
+        parts = []
+        if self.mode == 'ECB':
+            transform = self._cipher.decrypt_block if self.decrypt else self._cipher.encrypt_block
+            for i in range(0, len(view), BLOCK_SIZE):
+                parts.append(transform(view[i:i + BLOCK_SIZE]))
+        elif self.decrypt:
+            prev = self._register
+            for i in range(0, len(view), BLOCK_SIZE):
+                block = bytes(view[i:i + BLOCK_SIZE])
+                parts.append(xor_bytes(self._cipher.decrypt_block(block), prev))
+                prev = block
+            self._register = prev
+        else:
+            prev = self._register
+            for i in range(0, len(view), BLOCK_SIZE):
+                prev = self._cipher.encrypt_block(xor_bytes(view[i:i + BLOCK_SIZE], prev))
+                parts.append(prev)
+            self._register = prev
+        return b"".join(parts)
+
+    def _update_blocks(self, data: bytes) -> bytes:
+        """update() для ECB и CBC: обрабатывает все готовые блоки, хвост оставляет в буфере."""
+        buffer = self._buffer + data
+        ready = len(buffer) - len(buffer) % BLOCK_SIZE
+        # При расшифровании с паддингом последний полный блок придерживаем до finalize()
+        if self.decrypt and self.padding and ready == len(buffer):
+            ready -= BLOCK_SIZE
+        ready = max(ready, 0)
+        self._buffer = buffer[ready:]
+        return self._process_blocks(buffer[:ready])
+
+    # --- потоковые режимы ---
+
+    def _next_keystream(self) -> bytes:
+        """Следующий блок гаммы для OFB и CTR."""
+        if self.mode == 'OFB':
+            self._register = self._cipher.encrypt_block(self._register)
+            return self._register
+        block = self._cipher.encrypt_block(self._register)
+        counter = (int.from_bytes(self._register, 'big') + 1) % (1 << 128)
+        self._register = counter.to_bytes(BLOCK_SIZE, 'big')
+        return block
+
+    def _update_ofb_ctr(self, data: bytes) -> bytes:
+        """update() для OFB и CTR: вся гамма для порции собирается и XOR-ится за один раз."""
+        need = len(data) - len(self._keystream)
+        parts = [self._keystream]
+        while need > 0:
+            parts.append(self._next_keystream())
+            need -= BLOCK_SIZE
+        keystream = b"".join(parts)
+        self._keystream = keystream[len(data):]
+        return xor_bytes(data, keystream[:len(data)])
+
+    def _update_cfb(self, data: bytes) -> bytes:
+        """update() для CFB: обратная связь по шифртексту, допускает неполные блоки."""
+        parts = []
+        pos = 0
+        while pos < len(data):
+            if not self._keystream:
+                self._keystream = self._cipher.encrypt_block(self._register)
+            n = min(len(self._keystream), len(data) - pos)
+            chunk = data[pos:pos + n]
+            out = xor_bytes(chunk, self._keystream[:n])
+            self._keystream = self._keystream[n:]
+            self._feedback += chunk if self.decrypt else out
+            if len(self._feedback) == BLOCK_SIZE:
+                self._register, self._feedback = self._feedback, b""
+            parts.append(out)
+            pos += n
+        return b"".join(parts)
+
+    # --- публичный интерфейс ---
+
+    def update(self, data: bytes) -> bytes:
+        """
+        Обрабатывает очередную порцию данных.
+
+        :param data: порция данных произвольной длины
+        :return: готовая часть результата (может быть короче входа)
+        :raises ValueError: если finalize() уже был вызван
+        """
+        if self._finalized:
+            raise ValueError("Шифратор уже завершён.")
+        data = bytes(data)
+        if self.mode in PADDED_MODES:
+            return self._update_blocks(data)
+        if self._native is not None:
+            return self._native.decrypt(data) if self.decrypt else self._native.encrypt(data)
+        if self.mode == 'CFB':
+            return self._update_cfb(data)
+        return self._update_ofb_ctr(data)
+
+    def finalize(self) -> bytes:
+        """
+        Завершает обработку: добавляет или снимает паддинг и возвращает остаток.
+
+        :return: последняя часть результата
+        :raises ValueError: если длина данных или паддинг некорректны
+        """
+        if self._finalized:
+            raise ValueError("Шифратор уже завершён.")
+        self._finalized = True
+        if self.mode not in PADDED_MODES:
+            return b""
+
+        buffer, self._buffer = self._buffer, b""
+        if self.padding and not self.decrypt:
+            return self._process_blocks(pkcs7_pad(buffer))
+        if len(buffer) % BLOCK_SIZE != 0:
+            raise ValueError("Длина данных должна быть кратна 16 байтам.")
+        result = self._process_blocks(buffer)
+        return pkcs7_unpad(result) if self.padding else result
+
+
+def encryptor(key: bytes, mode: str, iv: Optional[bytes] = None, padding: bool = True) -> StreamingCipher:
+    """Создаёт потоковый шифратор (см. StreamingCipher)."""
+    return StreamingCipher(key, mode, iv, decrypt=False, padding=padding)
+
+
+def decryptor(key: bytes, mode: str, iv: Optional[bytes] = None, padding: bool = True) -> StreamingCipher:
+    """Создаёт потоковый дешифратор (см. StreamingCipher)."""
+    return StreamingCipher(key, mode, iv, decrypt=True, padding=padding)
+
+
+def process_stream(cipher: StreamingCipher, src: BinaryIO, dst: BinaryIO, buffer_size: int = 1 << 16) -> int:
+    """
+    Пропускает файл через шифратор буфером фиксированного размера.
+
+    :param cipher: потоковый шифратор или дешифратор
+    :param src: входной двоичный поток
+    :param dst: выходной двоичный поток
+    :param buffer_size: размер буфера чтения в байтах
+    :return: количество записанных байт
+    """
+    written = 0
+    while chunk := src.read(buffer_size):
+        out = cipher.update(chunk)
+        dst.write(out)
+        written += len(out)
+    out = cipher.finalize()
+    dst.write(out)
+    return written + len(out)
+
+
+if __name__ == '__main__':
+    example_key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    example_iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+    message = 'Съешь же ещё этих мягких французских булок'.encode('utf-8')
+
+    for example_mode in MODES:
+        enc = encryptor(example_key, example_mode, example_iv)
+        ciphertext = enc.update(message[:10]) + enc.update(message[10:]) + enc.finalize()
+        dec = decryptor(example_key, example_mode, example_iv)
+        plaintext = dec.update(ciphertext) + dec.finalize()
+        print(f'{example_mode}: {ciphertext.hex()} -> {plaintext.decode("utf-8")}')
@@ -0,0 +1,129 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Set
+
+import numpy as np
+
+from aes_batch import INV_S_BOX, R_CON, S_BOX, encrypt_array, round_keys
+
+# Оракул: принимает массив открытых текстов (N, 16) и возвращает шифртексты (N, 16)
+Oracle = Callable[[np.ndarray], np.ndarray]
+
+ATTACK_ROUNDS = 4
+
+
+# ===== Ослабленный шифр =====
+
+def make_oracle(key: bytes, rounds: int = ATTACK_ROUNDS) -> Oracle:
+    """
+    Оракул шифрования AES-128 с уменьшенным числом раундов.
+
+    :param key: секретный ключ 16 байт
+    :param rounds: число раундов
+    :return: функция, шифрующая массив блоков (N, 16)
+    """
+    rk = round_keys(key)
+    return lambda blocks: encrypt_array(blocks, rk, rounds)
+
+
+def lambda_set(active: int = 0, constant: int = 0) -> np.ndarray:
+    """
+    Λ-набор из 256 открытых текстов: байт active пробегает все значения,
+    остальные байты постоянны и равны constant.
+
+    :param active: номер активного байта (0..15)
+    :param constant: значение пассивных байт
+    :return: массив (256, 16) uint8
+    """
+    texts = np.full((256, 16), constant, dtype=np.uint8)
+    texts[:, active] = np.arange(256, dtype=np.uint8)
+    return texts
+
+
+# ===== Восстановление последнего раундового ключа =====
+
+def balanced_guesses(column: np.ndarray) -> Set[int]:
+    """
+    Векторизованная частичная расшифровка одного байта по всем 256 гипотезам.
+
+    Для гипотезы g вычисляется S⁻¹(c ^ g) для всех 256 шифртекстов Λ-набора;
+    верная гипотеза даёт нулевую XOR-сумму (свойство сбалансированности
+    после трёх раундов).
+
+    :param column: байт j всех 256 шифртекстов Λ-набора, массив (256,)
+    :return: множество гипотез, прошедших проверку
+    """
+    guesses = np.arange(256, dtype=np.uint8)[:, None]
+    sums = np.bitwise_xor.reduce(INV_S_BOX[column[None, :] ^ guesses], axis=1)
+    return set(np.flatnonzero(sums == 0).tolist())
+
+
+def recover_key_byte(columns: List[np.ndarray]) -> int:
+    """
+    Находит байт последнего раундового ключа по нескольким Λ-наборам.
+
+    :param columns: байт j шифртекстов для каждого Λ-набора
+    :return: единственный оставшийся кандидат
+    :raises ValueError: если кандидатов не осталось или осталось больше одного
+    """
+    candidates = set(range(256))
+    for column in columns:
+        candidates &= balanced_guesses(column)
+        if len(candidates) <= 1:
+            break
+    if len(candidates) != 1:
+        raise ValueError(f"Неоднозначный байт ключа: {len(candidates)} кандидатов.")
+    return candidates.pop()
+
+
+def invert_key_schedule(last_round_key: bytes, rounds: int = ATTACK_ROUNDS) -> bytes:
+    """
+    Восстанавливает исходный ключ по раундовому ключу номер rounds.
+
+    Расписание AES-128 обратимо: w[i - 4] = w[i] ^ temp(w[i - 1]).
+
+    :param last_round_key: раундовый ключ 16 байт
+    :param rounds: номер раунда, к которому относится ключ
+    :return: исходный ключ 16 байт
+    """
+    words = {4 * rounds + i: np.frombuffer(last_round_key[4 * i:4 * i + 4], dtype=np.uint8) for i in range(4)}
+    for i in range(4 * rounds + 3, 3, -1):
+        temp = words[i - 1]
+        if i % 4 == 0:
+            temp = S_BOX[np.roll(temp, -1)]
+            temp[0] ^= R_CON[i // 4 - 1]
+        words[i - 4] = words[i] ^ temp
+    return b"".join(words[i].tobytes() for i in range(4))
+
+
+def square_attack(oracle: Oracle, n_sets: int = 3, workers: Optional[int] = None) -> bytes:
+    """
+    Square-атака (интегральная) на 4-раундовый AES-128.
+
+    Шифрует n_sets Λ-наборов пачкой, затем для каждого из 16 байт последнего
+    раундового ключа перебирает все 256 гипотез векторизованно. Байты ключа
+    независимы и при workers > 1 обрабатываются параллельно в процессах.
+
+    :param oracle: оракул шифрования 4-раундового AES
+    :param n_sets: количество Λ-наборов (лишние отсекают ложные гипотезы)
+    :param workers: число процессов (None или 1 — в текущем процессе)
+    :return: восстановленный исходный ключ 16 байт
+    """
+    plaintexts = np.concatenate([lambda_set(0, constant) for constant in range(n_sets)])
+    ciphertexts = oracle(plaintexts).reshape(n_sets, 256, 16)
+    tasks = [[ciphertexts[s, :, j] for s in range(n_sets)] for j in range(16)]
+
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            last_round_key = bytes(pool.map(recover_key_byte, tasks))
+    else:
+        last_round_key = bytes(map(recover_key_byte, tasks))
+    return invert_key_schedule(last_round_key)
+
+
+if __name__ == '__main__':
+    secret_key = os.urandom(16)
+    recovered = square_attack(make_oracle(secret_key), workers=os.cpu_count())
+
+    print(f'Секретный ключ:        {secret_key.hex()}')
+    print(f'Восстановленный ключ:  {recovered.hex()}')
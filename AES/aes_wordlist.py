@@ -0,0 +1,225 @@
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aes_batch import match_keys
+
+KEY_SIZE = 16
+CHUNK_SIZE = 1 << 18  # байт словаря на одну задачу процесса
+
+LEET = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5', 't': '7'})
+
+# Правила мутаций: слово -> варианты-кандидаты
+RULES: Dict[str, Callable[[str], Iterable[str]]] = {
+    'none': lambda word: (word,),
+    'lower': lambda word: (word.lower(),),
+    'upper': lambda word: (word.upper(),),
+    'capitalize': lambda word: (word.capitalize(),),
+    'reverse': lambda word: (word[::-1],),
+    'leet': lambda word: (word.lower().translate(LEET),),
+    'digits': lambda word: (word + str(d) for d in range(10)),
+    'years': lambda word: (word + str(year) for year in range(1970, 2031)),
+}
+
+
+def string_key(word: str) -> bytes:
+    """
+    Ключ из строки, как в демонстрации aes.py: байты UTF-8, дополненные
+    нулями или обрезанные до 16 байт.
+
+    Слова словаря читаются с обработчиком surrogateescape, поэтому строки не
+    в UTF-8 (latin-1, cp1251 и т.п.) дают ключ из исходных байт строки.
+    """
+    return word.encode('utf-8', 'surrogateescape')[:KEY_SIZE].ljust(KEY_SIZE, b'\0')
+
+
+def mutate(words: Iterable[str], rules: Sequence[str]) -> Iterator[str]:
+    """Кандидаты по словам словаря и правилам мутаций (без повторов внутри слова)."""
+    for word in words:
+        seen = set()
+        for rule in rules:
+            for candidate in RULES[rule](word):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+
+def check_words(task: Tuple[List[str], Tuple[str, ...], bytes, bytes]) -> Tuple[List[str], int]:
+    """
+    Задача процесса: проверяет порцию словаря по известной паре блоков.
+
+    Ключи всех кандидатов порции расширяются и проверяются одним
+    векторизованным вызовом match_keys.
+
+    :param task: (слова, правила, открытый текст, шифртекст)
+    :return: (найденные кандидаты, число проверенных кандидатов)
+    """
+    words, rules, plaintext, ciphertext = task
+    candidates = list(mutate(words, rules))
+    if not candidates:
+        return [], 0
+    keys = b"".join(string_key(candidate) for candidate in candidates)
+    found = match_keys(plaintext, ciphertext, np.frombuffer(keys, dtype=np.uint8).reshape(-1, KEY_SIZE))
+    return [candidates[i] for i in found.tolist()], len(candidates)
+
+
+def read_chunks(path: str, offset: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Читает словарь порциями целых строк, начиная со смещения offset.
+
+    Байты, не образующие UTF-8, сохраняются через surrogateescape и
+    восстанавливаются в string_key без потерь.
+
+    :return: пары (смещение после порции, слова порции)
+    """
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                return
+            data += file.readline()  # дочитываем строку до конца
+            words = [line.rstrip(b'\r').decode('utf-8', 'surrogateescape') for line in data.split(b'\n')]
+            yield file.tell(), [word for word in words if word]
+
+
+def attack_params(plaintext: bytes, ciphertext: bytes, wordlist: str, rules: Sequence[str]) -> Dict[str, object]:
+    """Параметры перебора, к которым привязана контрольная точка."""
+    return {
+        'wordlist': os.path.abspath(wordlist),
+        'wordlist_size': os.path.getsize(wordlist),
+        'rules': list(rules),
+        'plaintext': bytes(plaintext).hex(),
+        'ciphertext': bytes(ciphertext).hex(),
+    }
+
+
+def load_checkpoint(path: Optional[str], params: Dict[str, object]) -> Dict[str, object]:
+    """
+    Состояние перебора из файла контрольной точки (или начальное).
+
+    :param params: параметры текущего перебора (attack_params)
+    :raises ValueError: если контрольная точка записана для другого словаря,
+                        правил или пары блоков
+    """
+    if path is None or not os.path.exists(path):
+        return {**params, 'offset': 0, 'tested': 0}
+    with open(path, 'r', encoding='utf-8') as file:
+        state = json.load(file)
+    mismatched = [name for name, value in params.items() if state.get(name) != value]
+    if mismatched:
+        raise ValueError(f"Контрольная точка {path!r} относится к другому перебору (не совпадают: "
+                         f"{', '.join(mismatched)}).")
+    return state
+
+
+def save_checkpoint(path: str, state: Dict[str, object]) -> None:
+    """Атомарно записывает контрольную точку."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(temp, path)
+
+
+def wordlist_attack(plaintext: bytes, ciphertext: bytes, wordlist: str, rules: Sequence[str] = ('none',),
+                    workers: Optional[int] = None, checkpoint: Optional[str] = None,
+                    chunk_size: int = CHUNK_SIZE, stop_on_first: bool = True,
+                    progress: Optional[Callable[[int, float, int], None]] = None) -> Dict[str, object]:
+    """
+    Восстановление строкового ключа AES по известной паре блоков.
+
+    Словарь читается потоково порциями, порции проверяются в пуле процессов;
+    в работе одновременно не больше двух порций на процесс, поэтому память не
+    зависит от размера словаря. После каждой завершённой по порядку порции
+    смещение в файле сохраняется в контрольную точку вместе с параметрами
+    перебора, и повторный запуск с теми же параметрами продолжает с него.
+
+    :param plaintext: открытый текст 16 байт
+    :param ciphertext: шифртекст 16 байт
+    :param wordlist: путь к словарю (по слову в строке; строки не в UTF-8 берутся как есть)
+    :param rules: имена правил мутаций из RULES
+    :param workers: число процессов (None — по числу ядер)
+    :param checkpoint: путь к файлу контрольной точки (None — без сохранения)
+    :param chunk_size: размер порции словаря в байтах
+    :param stop_on_first: остановиться после первого найденного ключа
+    :param progress: вызывается после каждой порции с (проверено, кандидатов/с, смещение)
+    :return: словарь с найденными кандидатами, числом проверенных, временем и скоростью
+    """
+    if len(plaintext) != 16 or len(ciphertext) != 16:
+        raise ValueError("Открытый текст и шифртекст должны быть по 16 байт.")
+    unknown = [rule for rule in rules if rule not in RULES]
+    if unknown:
+        raise ValueError(f"Неизвестные правила: {unknown}, доступны {tuple(RULES)}.")
+
+    rules = tuple(rules)
+    state = load_checkpoint(checkpoint, attack_params(plaintext, ciphertext, wordlist, rules))
+    found: List[str] = []
+    tested = 0
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        chunks = read_chunks(wordlist, state['offset'], chunk_size)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * workers:
+                try:
+                    offset, words = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append((offset, pool.submit(check_words, (words, rules, bytes(plaintext), bytes(ciphertext)))))
+            if not pending:
+                break
+
+            offset, future = pending.popleft()
+            hits, count = future.result()
+            found.extend(hits)
+            tested += count
+            state['offset'] = offset
+            state['tested'] += count
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, state)
+            if progress is not None:
+                progress(state['tested'], tested / max(time.perf_counter() - start, 1e-9), offset)
+            if found and stop_on_first:
+                for _, rest in pending:
+                    rest.cancel()
+                break
+
+    elapsed = time.perf_counter() - start
+    return {
+        'found': found,
+        'keys': [string_key(word) for word in found],
+        'tested': state['tested'],
+        'elapsed': elapsed,
+        'rate': tested / elapsed if elapsed else 0.0,
+        'offset': state['offset'],
+    }
+
+
+if __name__ == '__main__':
+    from aes import AES
+
+    secret = 'morozov2024'
+    example_plaintext = b'ccDanyaMorozovcc'
+    example_ciphertext = AES(string_key(secret)).encrypt_block(example_plaintext)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        wordlist_path = os.path.join(workdir, 'words.txt')
+        with open(wordlist_path, 'w', encoding='utf-8') as wordlist_file:
+            wordlist_file.write('\n'.join(f'word{i}' for i in range(50_000)) + '\nmorozov\n')
+
+        result = wordlist_attack(example_plaintext, example_ciphertext, wordlist_path,
+                                 rules=('none', 'years'),
+                                 checkpoint=os.path.join(workdir, 'attack.json'))
+        print(f"Найдено: {result['found']}, проверено {result['tested']} кандидатов, "
+              f"{result['rate']:.0f} кандидатов/с")
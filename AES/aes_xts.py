@@ -0,0 +1,220 @@
+import mmap
+from typing import BinaryIO, Callable
+
+from aes_backend import block_cipher
+
+BLOCK_SIZE = 16
+SECTOR_SIZE = 4096
+MASK_128 = (1 << 128) - 1
+
+
+# ===== Арифметика твика =====
+
+def mul_alpha(t: int) -> int:
+    """
+    Умножение твика на α в GF(2^128) (порядок байт little-endian, IEEE 1619).
+
+    Сдвиг влево на один бит и XOR с 0x87 при переносе из старшего бита.
+    """
+    return ((t << 1) & MASK_128) ^ (0x87 if t >> 127 else 0)
+
+
+# ===== Шифр XTS =====
+
+class AESXTS:
+    """
+    AES-128-XTS для посекторного шифрования образов дисков.
+
+    Ключ из 32 байт делится на ключ данных и ключ твика. Каждый сектор
+    шифруется независимо, твик сектора — E_K2(номер сектора), для каждого
+    следующего блока он умножается на α. Последний неполный блок сектора
+    обрабатывается кражей шифртекста (ciphertext stealing).
+    """
+
+    def __init__(self, key: bytes, sector_size: int = SECTOR_SIZE) -> None:
+        """
+        :param key: ключ 32 байта (ключ данных || ключ твика)
+        :param sector_size: размер сектора в байтах (не меньше 16)
+        :raises ValueError: если длина ключа или размер сектора некорректны
+        """
+        if len(key) != 32:
+            raise ValueError("Длина ключа XTS должна быть 32 байта.")
+        if key[:16] == key[16:]:
+            raise ValueError("Ключ данных и ключ твика должны различаться.")
+        if sector_size < BLOCK_SIZE:
+            raise ValueError("Размер сектора должен быть не меньше 16 байт.")
+        self.sector_size = sector_size
+        self._data_cipher = block_cipher(key[:16])
+        self._tweak_cipher = block_cipher(key[16:])
+
+    def _tweak(self, sector: int) -> int:
+        """Начальный твик сектора как 128-битное little-endian число."""
+        block = self._tweak_cipher.encrypt_block(sector.to_bytes(BLOCK_SIZE, 'little'))
+        return int.from_bytes(block, 'little')
+
+    @staticmethod
+    def _xex(transform: Callable[[bytes], bytes], block: bytes, t: int) -> bytes:
+        """Один блок XEX: XOR с твиком, блочное преобразование, XOR с твиком."""
+        x = (int.from_bytes(block, 'little') ^ t).to_bytes(BLOCK_SIZE, 'little')
+        return (int.from_bytes(transform(x), 'little') ^ t).to_bytes(BLOCK_SIZE, 'little')
+
+    def encrypt_sector(self, sector: int, data: bytes) -> bytes:
+        """
+        Шифрует один сектор.
+
+        :param sector: номер сектора (data unit sequence number)
+        :param data: данные сектора, не меньше 16 байт
+        :return: шифртекст той же длины
+        """
+        if len(data) < BLOCK_SIZE:
+            raise ValueError("Длина данных сектора должна быть не меньше 16 байт.")
+        encrypt = self._data_cipher.encrypt_block
+        full, tail = divmod(len(data), BLOCK_SIZE)
+        if tail:
+            full -= 1
+
+        t = self._tweak(sector)
+        parts = []
+        for i in range(0, full * BLOCK_SIZE, BLOCK_SIZE):
+            parts.append(self._xex(encrypt, data[i:i + BLOCK_SIZE], t))
+            t = mul_alpha(t)
+
+        if tail:
+            # Кража шифртекста: хвост берёт начало предпоследнего блока шифртекста
+            offset = full * BLOCK_SIZE
+            cc = self._xex(encrypt, data[offset:offset + BLOCK_SIZE], t)
+            pp = data[offset + BLOCK_SIZE:] + cc[tail:]
+            parts.append(self._xex(encrypt, pp, mul_alpha(t)))
+            parts.append(cc[:tail])
+        return b"".join(parts)
+
+    def decrypt_sector(self, sector: int, data: bytes) -> bytes:
+        """
+        Расшифровывает один сектор.
+
+        :param sector: номер сектора (data unit sequence number)
+        :param data: шифртекст сектора, не меньше 16 байт
+        :return: открытый текст той же длины
+        """
+        if len(data) < BLOCK_SIZE:
+            raise ValueError("Длина данных сектора должна быть не меньше 16 байт.")
+        decrypt = self._data_cipher.decrypt_block
+        full, tail = divmod(len(data), BLOCK_SIZE)
+        if tail:
+            full -= 1
+
+        t = self._tweak(sector)
+        parts = []
+        for i in range(0, full * BLOCK_SIZE, BLOCK_SIZE):
+            parts.append(self._xex(decrypt, data[i:i + BLOCK_SIZE], t))
+            t = mul_alpha(t)
+
+        if tail:
+            offset = full * BLOCK_SIZE
+            pp = self._xex(decrypt, data[offset:offset + BLOCK_SIZE], mul_alpha(t))
+            cc = data[offset + BLOCK_SIZE:] + pp[tail:]
+            parts.append(self._xex(decrypt, cc, t))
+            parts.append(pp[:tail])
+        return b"".join(parts)
+
+    def encrypt_sectors(self, first_sector: int, data: bytes) -> bytes:
+        """
+        Шифрует последовательность секторов, начиная с first_sector.
+
+        Последний сектор может быть короче sector_size (но не короче 16 байт).
+        """
+        size = self.sector_size
+        return b"".join(self.encrypt_sector(first_sector + i // size, data[i:i + size])
+                        for i in range(0, len(data), size))
+
+    def decrypt_sectors(self, first_sector: int, data: bytes) -> bytes:
+        """Расшифровывает последовательность секторов, начиная с first_sector."""
+        size = self.sector_size
+        return b"".join(self.decrypt_sector(first_sector + i // size, data[i:i + size])
+                        for i in range(0, len(data), size))
+
+
+# ===== Зашифрованный образ на отображённом в память файле =====
+
+class XTSVolume:
+    """
+    Зашифрованный образ тома с произвольным доступом к секторам через mmap.
+
+    Чтение и запись сектора затрагивают только его собственные байты в файле,
+    поэтому перезапись одного сектора стоит O(размер сектора).
+    """
+
+    def __init__(self, file: BinaryIO, key: bytes, sector_size: int = SECTOR_SIZE) -> None:
+        """
+        :param file: файл образа, открытый в режиме 'r+b' (непустой)
+        :param key: ключ XTS 32 байта
+        :param sector_size: размер сектора в байтах
+        """
+        self.xts = AESXTS(key, sector_size)
+        self.sector_size = sector_size
+        self._map = mmap.mmap(file.fileno(), 0)
+        if len(self._map) % sector_size != 0:
+            self._map.close()
+            raise ValueError("Размер образа должен быть кратен размеру сектора.")
+
+    @property
+    def sector_count(self) -> int:
+        """Количество секторов в образе."""
+        return len(self._map) // self.sector_size
+
+    def _span(self, first_sector: int, count: int) -> slice:
+        """Срез байт образа для диапазона секторов с проверкой границ."""
+        if first_sector < 0 or count < 0 or first_sector + count > self.sector_count:
+            raise ValueError("Диапазон секторов выходит за пределы образа.")
+        return slice(first_sector * self.sector_size, (first_sector + count) * self.sector_size)
+
+    def read_sectors(self, first_sector: int, count: int = 1) -> bytes:
+        """Читает и расшифровывает count секторов, начиная с first_sector."""
+        return self.xts.decrypt_sectors(first_sector, self._map[self._span(first_sector, count)])
+
+    def write_sectors(self, first_sector: int, plaintext: bytes) -> None:
+        """
+        Шифрует и записывает целые сектора, начиная с first_sector.
+
+        :param plaintext: данные, длина которых кратна sector_size
+        """
+        if len(plaintext) % self.sector_size != 0:
+            raise ValueError("Длина данных должна быть кратна размеру сектора.")
+        span = self._span(first_sector, len(plaintext) // self.sector_size)
+        self._map[span] = self.xts.encrypt_sectors(first_sector, plaintext)
+
+    def encrypt_in_place(self, first_sector: int, count: int) -> None:
+        """Шифрует диапазон секторов прямо в файле (данные в нём — открытый текст)."""
+        span = self._span(first_sector, count)
+        self._map[span] = self.xts.encrypt_sectors(first_sector, self._map[span])
+
+    def decrypt_in_place(self, first_sector: int, count: int) -> None:
+        """Расшифровывает диапазон секторов прямо в файле."""
+        span = self._span(first_sector, count)
+        self._map[span] = self.xts.decrypt_sectors(first_sector, self._map[span])
+
+    def flush(self) -> None:
+        """Сбрасывает изменения отображения на диск."""
+        self._map.flush()
+
+    def close(self) -> None:
+        """Сбрасывает изменения и закрывает отображение."""
+        self._map.flush()
+        self._map.close()
+
+    def __enter__(self) -> 'XTSVolume':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    # Тестовый вектор 2 из IEEE 1619-2007
+    example_key = bytes.fromhex('11' * 16 + '22' * 16)
+    example_plaintext = bytes.fromhex('44' * 32)
+
+    xts = AESXTS(example_key)
+    encrypted = xts.encrypt_sector(0x3333333333, example_plaintext)
+    print(f'Шифртекст:   {encrypted.hex()}')
+    print(f'Расшифровка: {xts.decrypt_sector(0x3333333333, encrypted).hex()}')
@@ -0,0 +1,91 @@
+import os
+from time import perf_counter
+from typing import Callable
+
+import aes_batch
+from aes_bitslice import BitslicedAES
+from aes import AES, aes_decrypt_block, aes_encrypt_block_ttable
+from aes_backend import get_backend
+from aes_codegen import compile_cipher
+
+
+def measure(transform: Callable[[bytes], bytes], blocks: list[bytes]) -> float:
+    """
+    Измеряет пропускную способность функции обработки блока.
+
+    :param transform: функция вида transform(block) -> bytes
+    :param blocks: блоки данных по 16 байт
+    :return: количество блоков в секунду
+    """
+    start = perf_counter()
+    for block in blocks:
+        transform(block)
+    return len(blocks) / (perf_counter() - start)
+
+
+def measure_bulk(transform: Callable[[bytes], bytes], data: bytes) -> float:
+    """
+    Измеряет пропускную способность функции, обрабатывающей сразу много блоков.
+
+    :param transform: функция вида transform(data) -> bytes
+    :param data: данные, длина которых кратна 16 байтам
+    :return: количество блоков в секунду
+    """
+    start = perf_counter()
+    transform(data)
+    return len(data) // 16 / (perf_counter() - start)
+
+
+def report(title: str, rate: float, baseline: float) -> None:
+    """Печатает строку отчёта с ускорением относительно базового варианта."""
+    print(f"{title:<32}{rate:10.0f} блоков/с (x{rate / baseline:.1f})")
+
+
+def crossover(key: bytes, per_block: float) -> None:
+    """
+    Сравнивает битсрезовый движок с поблочным для разной ширины пачки.
+
+    :param key: ключ шифрования
+    :param per_block: скорость поблочного контекста AES, блоков/с
+    """
+    print("Битсрез против поблочного контекста AES:")
+    for lanes in (16, 64, 256, 1024, 4096, 16384):
+        cipher = BitslicedAES(key, lanes=lanes)
+        data = os.urandom(16 * lanes)
+        report(f"  пачка {lanes} блоков", measure_bulk(cipher.encrypt_blocks, data), per_block)
+
+
+def main() -> None:
+    """Entry point."""
+    key: bytes = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+    blocks: list[bytes] = [os.urandom(16) for _ in range(2000)]
+    cipher = AES(key)
+
+    for block in blocks[:100]:
+        assert cipher.encrypt_block_reference(block) == aes_encrypt_block_ttable(block, key)
+        assert cipher.decrypt_block(cipher.encrypt_block(block)) == block
+        assert cipher.decrypt_block_reference(cipher.encrypt_block(block)) == block
+
+    reference = measure(lambda block: AES(key).encrypt_block_reference(block), blocks)
+    report("Эталонный движок", reference, reference)
+    report("T-таблицы", measure(lambda block: aes_encrypt_block_ttable(block, key), blocks), reference)
+    per_block = measure(cipher.encrypt_block, blocks)
+    report("Контекст AES: шифрование", per_block, reference)
+    report("Сгенерированный код", measure(compile_cipher(key).encrypt_block, blocks), reference)
+    data = os.urandom(16 * 100_000)
+    assert aes_batch.encrypt_blocks(data[:1600], key) == cipher.encrypt_blocks(data[:1600])
+    report("NumPy, 100000 блоков", measure_bulk(lambda d: aes_batch.encrypt_blocks(d, key), data), reference)
+
+    decrypt = measure(cipher.decrypt_block_reference, blocks)
+    report("Эталонное расшифрование", decrypt, decrypt)
+    # aes_decrypt_block идёт через текущий бэкенд, поэтому в подписи указан бэкенд
+    report(f"aes_decrypt_block [{get_backend().name}]",
+           measure(lambda block: aes_decrypt_block(block, key), blocks), decrypt)
+    report("Контекст AES: расшифрование", measure(cipher.decrypt_block, blocks), decrypt)
+
+    assert BitslicedAES(key).encrypt_blocks(data[:1600]) == cipher.encrypt_blocks(data[:1600])
+    crossover(key, per_block)
+
+
+if __name__ == '__main__':
+    main()
@@ -310,19 +310,19 @@ def decrypt_block(block: bytes, key: bytes) -> bytes:
 
 def encrypt_message(data: bytes, key: bytes) -> bytes:
     """Шифрует произвольные данные (байты)."""
+    from des_fast import DES  # отложенный импорт: des_fast берёт таблицы из этого модуля
+
     # паддинг нулями до 8 байт
-    while len(data) % 8 != 0:
-        data = b"\x00" + data
-    blocks = [data[i:i + 8] for i in range(0, len(data), 8)]
-    return b"".join(encrypt_block(block, key) for block in blocks)
+    data = bytes(-len(data) % 8) + data
+    return DES(key).encrypt_blocks(data)
 
 
 def decrypt_message(data: bytes, key: bytes) -> bytes:
     """Дешифрует произвольные данные (байты)."""
-    while len(data) % 8 != 0:
-        data = b"\x00" + data
-    blocks = [data[i:i + 8] for i in range(0, len(data), 8)]
-    return b"".join(decrypt_block(block, key) for block in blocks)
+    from des_fast import DES
+
+    data = bytes(-len(data) % 8) + data
+    return DES(key).decrypt_blocks(data)
 
 
 def main() -> None:
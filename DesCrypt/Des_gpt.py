@@ -2,6 +2,8 @@ import math
 import os
 import base64
 
+from des_fast import DES
+
 # БЛОК С МАТРИЦАМИ ПЕРЕСТАНОВОК
 
 pc1: list[int] = [
@@ -324,21 +326,14 @@ def decrypt(ciphertext: bytes, key: bytes) -> bytes:
 def encrypt_message(plaintext: str, key: str) -> str:
     """Шифрует сообщение (строка -> base64)."""
     data = pad(plaintext.encode("utf-8"))
-    result = b""
-    for i in range(0, len(data), 8):
-        block = data[i:i + 8]
-        result += encrypt(block, key.encode("utf-8"))
-    return base64.b64encode(result).decode("utf-8")
+    # Как и в encrypt(), PC-1 использует только первые 8 байт ключа
+    return base64.b64encode(DES(key.encode("utf-8")[:8]).encrypt_blocks(data)).decode("utf-8")
 
 
 def decrypt_message(ciphertext: str, key: str) -> str:
     """Расшифровывает сообщение (base64 -> строка)."""
     data = base64.b64decode(ciphertext.encode("utf-8"))
-    result = b""
-    for i in range(0, len(data), 8):
-        block = data[i:i + 8]
-        result += decrypt(block, key.encode("utf-8"))
-    return unpad(result).decode("utf-8")
+    return unpad(DES(key.encode("utf-8")[:8]).decrypt_blocks(data)).decode("utf-8")
 
 
 def main() -> None:
@@ -0,0 +1,302 @@
+import os
+from time import perf_counter
+
+from DES import ip, ip_inverse, p_box, pc1, pc2, s_boxes
+
+# Целочисленный движок DES. Блок, половины и раундовые ключи хранятся как
+# int, бит 0 таблиц перестановок — старший бит числа (как в word_to_bits).
+# Каждая перестановка разбивается по байтам входа: для байта j и значения v
+# заранее вычислен вклад этих восьми бит в результат, поэтому перестановка —
+# это OR нескольких обращений к таблицам вместо цикла по битам.
+
+SHIFTS: list[int] = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+
+# Расширение E в виде порядка бит (то же, что делает extend() в DES.py)
+e_box: list[int] = [(4 * (i // 6) + i % 6 - 1) % 32 for i in range(48)]
+
+
+# БЛОК С ТАБЛИЦАМИ
+
+def permutation_tables(order: list[int], in_bits: int) -> list[list[int]]:
+    """
+    Байтовые таблицы перестановки.
+
+    order[i] — номер входного бита, который становится i-м битом результата
+    (нумерация со старшего бита, с нуля); результат имеет len(order) бит.
+    tables[j][v] — вклад байта j входа со значением v.
+    """
+    out_bits = len(order)
+    tables: list[list[int]] = []
+    for j in range(in_bits // 8):
+        table = []
+        for value in range(256):
+            result = 0
+            for i, source in enumerate(order):
+                if source // 8 == j and value >> (7 - source % 8) & 1:
+                    result |= 1 << (out_bits - 1 - i)
+            table.append(result)
+        tables.append(table)
+    return tables
+
+
+def permute(x: int, tables: list[list[int]]) -> int:
+    """Перестановка числа по байтовым таблицам."""
+    result = 0
+    last = len(tables) - 1
+    for j, table in enumerate(tables):
+        result |= table[(x >> (8 * (last - j))) & 0xFF]
+    return result
+
+
+def s_box_tables() -> list[list[int]]:
+    """
+    S-блоки, индексируемые сразу шестибитным входом: строка — крайние биты,
+    столбец — средние; результат уже сдвинут на место в 32-битном выходе.
+    """
+    tables = []
+    for i, box in enumerate(s_boxes):
+        shift = 28 - 4 * i
+        tables.append([box[(v >> 4 & 2) | (v & 1)][(v >> 1) & 0xF] << shift for v in range(64)])
+    return tables
+
+
+def sp_tables(s_tables: list[list[int]], p_tables: list[list[int]]) -> list[list[int]]:
+    """
+    Совмещённые SP-таблицы: для каждого S-блока и шестибитного входа —
+    его четыре выходных бита, уже переставленные P-блоком. Перестановка
+    линейна относительно OR, поэтому P(S1 | ... | S8) = P(S1) | ... | P(S8).
+    """
+    return [[permute(value, p_tables) for value in table] for table in s_tables]
+
+
+IP_TABLES = permutation_tables(ip, 64)
+FP_TABLES = permutation_tables(ip_inverse, 64)
+E_TABLES = permutation_tables(e_box, 32)
+P_TABLES = permutation_tables(p_box, 32)
+PC1_TABLES = permutation_tables(pc1, 64)
+PC2_TABLES = permutation_tables(pc2, 56)
+S_TABLES = s_box_tables()
+SP_TABLES = sp_tables(S_TABLES, P_TABLES)
+
+
+# ФУНКЦИИ ШИФРОВАНИЯ
+
+def get_round_keys(key: bytes) -> list[int]:
+    """16 раундовых ключей по 48 бит для ключа из 8 байт."""
+    if len(key) != 8:
+        raise ValueError("Длина ключа должна быть 8 байт.")
+    cd = permute(int.from_bytes(key, 'big'), PC1_TABLES)
+    c, d = cd >> 28, cd & 0xFFFFFFF
+
+    round_keys: list[int] = []
+    for shift in SHIFTS:
+        c = ((c << shift) | (c >> (28 - shift))) & 0xFFFFFFF
+        d = ((d << shift) | (d >> (28 - shift))) & 0xFFFFFFF
+        round_keys.append(permute(c << 28 | d, PC2_TABLES))
+    return round_keys
+
+
+def crypt_block(block: int, round_keys: list[int]) -> int:
+    """
+    16 раундов сети Фейстеля над 64-битным числом.
+
+    Для расшифрования передаются раундовые ключи в обратном порядке.
+    """
+    ip0, ip1, ip2, ip3, ip4, ip5, ip6, ip7 = IP_TABLES
+    e0, e1, e2, e3 = E_TABLES
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP_TABLES
+
+    x = (ip0[block >> 56] | ip1[block >> 48 & 0xFF] | ip2[block >> 40 & 0xFF] | ip3[block >> 32 & 0xFF]
+         | ip4[block >> 24 & 0xFF] | ip5[block >> 16 & 0xFF] | ip6[block >> 8 & 0xFF] | ip7[block & 0xFF])
+    left, right = x >> 32, x & 0xFFFFFFFF
+
+    for key in round_keys:
+        e = (e0[right >> 24] | e1[right >> 16 & 0xFF] | e2[right >> 8 & 0xFF] | e3[right & 0xFF]) ^ key
+        left, right = right, left ^ (sp0[e >> 42] | sp1[e >> 36 & 0x3F] | sp2[e >> 30 & 0x3F]
+                                     | sp3[e >> 24 & 0x3F] | sp4[e >> 18 & 0x3F] | sp5[e >> 12 & 0x3F]
+                                     | sp6[e >> 6 & 0x3F] | sp7[e & 0x3F])
+
+    return permute(right << 32 | left, FP_TABLES)
+
+
+def crypt_block_ede(block: int, schedules: tuple[list[int], list[int], list[int]]) -> int:
+    """
+    Три прохода DES (E-D-E) как одна сеть Фейстеля из 48 раундов.
+
+    Между проходами FP предыдущего и IP следующего взаимно уничтожаются,
+    поэтому IP и FP выполняются по одному разу, а на стыке проходов
+    остаётся только обмен половин.
+
+    :param block: 64-битное число
+    :param schedules: раундовые ключи трёх проходов (для D — в обратном порядке)
+    """
+    ip0, ip1, ip2, ip3, ip4, ip5, ip6, ip7 = IP_TABLES
+    e0, e1, e2, e3 = E_TABLES
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP_TABLES
+
+    x = (ip0[block >> 56] | ip1[block >> 48 & 0xFF] | ip2[block >> 40 & 0xFF] | ip3[block >> 32 & 0xFF]
+         | ip4[block >> 24 & 0xFF] | ip5[block >> 16 & 0xFF] | ip6[block >> 8 & 0xFF] | ip7[block & 0xFF])
+    left, right = x >> 32, x & 0xFFFFFFFF
+
+    for round_keys in schedules:
+        for key in round_keys:
+            e = (e0[right >> 24] | e1[right >> 16 & 0xFF] | e2[right >> 8 & 0xFF] | e3[right & 0xFF]) ^ key
+            left, right = right, left ^ (sp0[e >> 42] | sp1[e >> 36 & 0x3F] | sp2[e >> 30 & 0x3F]
+                                         | sp3[e >> 24 & 0x3F] | sp4[e >> 18 & 0x3F] | sp5[e >> 12 & 0x3F]
+                                         | sp6[e >> 6 & 0x3F] | sp7[e & 0x3F])
+        left, right = right, left
+
+    return permute(left << 32 | right, FP_TABLES)
+
+
+def encrypt_block(block: bytes, key: bytes) -> bytes:
+    """Шифрует ровно 8 байт (64 бита)."""
+    return crypt_block(int.from_bytes(block, 'big'), get_round_keys(key)).to_bytes(8, 'big')
+
+
+def decrypt_block(block: bytes, key: bytes) -> bytes:
+    """Дешифрует ровно 8 байт (64 бита)."""
+    return crypt_block(int.from_bytes(block, 'big'), get_round_keys(key)[::-1]).to_bytes(8, 'big')
+
+
+class DES:
+    """
+    Контекст DES с однократно вычисленными раундовыми ключами.
+
+    16 раундовых ключей и их обратный порядок для расшифрования вычисляются
+    в конструкторе, поэтому на каждый блок приходится только сама сеть
+    Фейстеля.
+    """
+
+    block_size = 8
+
+    def __init__(self, key: bytes) -> None:
+        """
+        :param key: ключ 8 байт
+        :raises ValueError: если длина ключа не равна 8 байтам
+        """
+        self.key = bytes(key)
+        self.round_keys = get_round_keys(self.key)
+        self.inverse_round_keys = self.round_keys[::-1]
+
+    def encrypt_int(self, block: int) -> int:
+        """Шифрует 64-битное число."""
+        return crypt_block(block, self.round_keys)
+
+    def decrypt_int(self, block: int) -> int:
+        """Дешифрует 64-битное число."""
+        return crypt_block(block, self.inverse_round_keys)
+
+    def encrypt_block(self, block: bytes) -> bytes:
+        """Шифрует ровно 8 байт (64 бита)."""
+        return crypt_block(int.from_bytes(block, 'big'), self.round_keys).to_bytes(8, 'big')
+
+    def decrypt_block(self, block: bytes) -> bytes:
+        """Дешифрует ровно 8 байт (64 бита)."""
+        return crypt_block(int.from_bytes(block, 'big'), self.inverse_round_keys).to_bytes(8, 'big')
+
+    @staticmethod
+    def _crypt_blocks(data: bytes, round_keys: list[int]) -> bytes:
+        if len(data) % 8 != 0:
+            raise ValueError("Длина данных должна быть кратна 8 байтам.")
+        view = memoryview(data)
+        return b"".join(crypt_block(int.from_bytes(view[i:i + 8], 'big'), round_keys).to_bytes(8, 'big')
+                        for i in range(0, len(view), 8))
+
+    def encrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Шифрует последовательность блоков независимо друг от друга (ECB).
+
+        :param data: байтоподобные данные, длина кратна 8
+        :raises ValueError: если длина данных не кратна 8 байтам
+        """
+        return self._crypt_blocks(data, self.round_keys)
+
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """
+        Расшифровывает последовательность блоков независимо друг от друга (ECB).
+
+        :param data: байтоподобные данные, длина кратна 8
+        :raises ValueError: если длина данных не кратна 8 байтам
+        """
+        return self._crypt_blocks(data, self.inverse_round_keys)
+
+
+class TripleDES(DES):
+    """
+    3DES в режиме EDE: C = E_K3(D_K2(E_K1(P))).
+
+    Ключ 16 байт — вариант с двумя ключами (K3 = K1), 24 байта — с тремя.
+    Раундовые ключи всех проходов вычисляются один раз, блок шифруется одним
+    48-раундовым проходом (crypt_block_ede) с единственными IP и FP.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        """
+        :param key: ключ 16 или 24 байта
+        :raises ValueError: если длина ключа другая
+        """
+        if len(key) not in (16, 24):
+            raise ValueError("Длина ключа 3DES должна быть 16 или 24 байта.")
+        self.key = bytes(key)
+        k1, k2 = get_round_keys(self.key[:8]), get_round_keys(self.key[8:16])
+        k3 = get_round_keys(self.key[16:]) if len(self.key) == 24 else k1
+        self.round_keys = (k1, k2[::-1], k3)
+        self.inverse_round_keys = (k3[::-1], k2, k1[::-1])
+
+    def encrypt_int(self, block: int) -> int:
+        """Шифрует 64-битное число."""
+        return crypt_block_ede(block, self.round_keys)
+
+    def decrypt_int(self, block: int) -> int:
+        """Дешифрует 64-битное число."""
+        return crypt_block_ede(block, self.inverse_round_keys)
+
+    def encrypt_block(self, block: bytes) -> bytes:
+        """Шифрует ровно 8 байт (64 бита)."""
+        return crypt_block_ede(int.from_bytes(block, 'big'), self.round_keys).to_bytes(8, 'big')
+
+    def decrypt_block(self, block: bytes) -> bytes:
+        """Дешифрует ровно 8 байт (64 бита)."""
+        return crypt_block_ede(int.from_bytes(block, 'big'), self.inverse_round_keys).to_bytes(8, 'big')
+
+    @staticmethod
+    def _crypt_blocks(data: bytes, round_keys: tuple) -> bytes:
+        if len(data) % 8 != 0:
+            raise ValueError("Длина данных должна быть кратна 8 байтам.")
+        view = memoryview(data)
+        return b"".join(crypt_block_ede(int.from_bytes(view[i:i + 8], 'big'), round_keys).to_bytes(8, 'big')
+                        for i in range(0, len(view), 8))
+
+
+if __name__ == '__main__':
+    import DES as des_bits
+    import Des_gpt
+
+    key: bytes = b"ecliptic"
+    blocks: list[bytes] = [os.urandom(8) for _ in range(300)]
+    for block in blocks:
+        encrypted = encrypt_block(block, key)
+        assert encrypted == des_bits.encrypt_block(block, key) == Des_gpt.encrypt(block, key)
+        assert decrypt_block(encrypted, key) == block
+
+    start = perf_counter()
+    for block in blocks:
+        des_bits.encrypt_block(block, key)
+    bits_rate = len(blocks) / (perf_counter() - start)
+
+    round_keys = get_round_keys(key)
+    start = perf_counter()
+    for block in blocks * 20:
+        crypt_block(int.from_bytes(block, 'big'), round_keys)
+    int_rate = 20 * len(blocks) / (perf_counter() - start)
+
+    print(f"Списки бит:      {bits_rate:10.0f} блоков/с")
+    print(f"Целые числа:     {int_rate:10.0f} блоков/с (x{int_rate / bits_rate:.1f})")
+
+    cipher = DES(key)
+    data = os.urandom(8 * 20_000)
+    start = perf_counter()
+    assert cipher.decrypt_blocks(cipher.encrypt_blocks(data)) == data
+    context_rate = 2 * len(data) / 8 / (perf_counter() - start)
+    print(f"Контекст DES:    {context_rate:10.0f} блоков/с (x{context_rate / bits_rate:.1f})")
@@ -0,0 +1,235 @@
+import os
+from typing import BinaryIO, Optional, Union
+
+from des_fast import DES, TripleDES
+
+BLOCK_SIZE = 8
+MODES = ('ECB', 'CBC', 'CTR')
+PADDED_MODES = ('ECB', 'CBC')
+COUNTER_MASK = (1 << 64) - 1
+
+Cipher = Union[DES, TripleDES]
+
+
+def pad(data: bytes) -> bytes:
+    """PKCS#7 padding."""
+    pad_len = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return data + bytes([pad_len] * pad_len)
+
+
+def unpad(data: bytes) -> bytes:
+    """
+    Удаляет PKCS#7 padding.
+
+    :raises ValueError: если паддинг некорректен
+    """
+    if not data or len(data) % BLOCK_SIZE != 0:
+        raise ValueError("Invalid padding")
+    pad_len = data[-1]
+    if pad_len < 1 or pad_len > BLOCK_SIZE or data[-pad_len:] != bytes([pad_len] * pad_len):
+        raise ValueError("Invalid padding")
+    return data[:-pad_len]
+
+
+class StreamingCipher:
+    """
+    Потоковый шифратор/дешифратор DES и 3DES в режимах ECB, CBC и CTR.
+
+    Работает с любым контекстом из des_fast (DES или TripleDES): блоки
+    обрабатываются как 64-битные числа через encrypt_int/decrypt_int, цепочка
+    CBC и гамма CTR — XOR чисел. Данные подаются порциями через update() или
+    update_into(), остаток и PKCS#7 (ECB, CBC) обрабатываются в finalize().
+    Между вызовами хранится не больше одного блока, результат пишется в
+    заранее выделенный буфер, поэтому время линейно, а память постоянна.
+    """
+
+    def __init__(self, cipher: Cipher, mode: str, iv: Optional[bytes] = None,
+                 decrypt: bool = False, padding: bool = True) -> None:
+        """
+        :param cipher: контекст DES или TripleDES
+        :param mode: один из MODES
+        :param iv: вектор инициализации 8 байт (для CTR — начальный блок счётчика);
+                   не используется в ECB
+        :param decrypt: True — расшифрование, False — шифрование
+        :param padding: использовать PKCS#7 в режимах ECB и CBC
+        :raises ValueError: если режим неизвестен или длина iv некорректна
+        """
+        mode = mode.upper()
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим {mode!r}, ожидается один из {MODES}.")
+        if mode == 'ECB':
+            iv = bytes(BLOCK_SIZE)
+        elif iv is None or len(iv) != BLOCK_SIZE:
+            raise ValueError("Длина вектора инициализации должна быть 8 байт.")
+        self.mode = mode
+        self.decrypt = decrypt
+        self.padding = padding and mode in PADDED_MODES
+        self._cipher = cipher
+        self._register = int.from_bytes(iv, 'big')  # CBC: предыдущий блок шифртекста; CTR: счётчик
+        self._buffer = b""                          # ECB/CBC: необработанный хвост
+        self._keystream = b""                       # CTR: неиспользованный остаток гаммы
+        self._finalized = False
+
+    # --- обработка ---
+
+    def _process_blocks(self, data: bytes, out: memoryview) -> None:
+        """Обрабатывает целое число блоков ECB или CBC, записывая результат в out."""
+        view = memoryview(data)
+        size = BLOCK_SIZE
+        if self.mode == 'ECB':
+            transform = self._cipher.decrypt_int if self.decrypt else self._cipher.encrypt_int
+            for i in range(0, len(view), size):
+                out[i:i + size] = transform(int.from_bytes(view[i:i + size], 'big')).to_bytes(size, 'big')
+            return
+
+        prev = self._register
+        if self.decrypt:
+            transform = self._cipher.decrypt_int
+            for i in range(0, len(view), size):
+                block = int.from_bytes(view[i:i + size], 'big')
+                out[i:i + size] = (transform(block) ^ prev).to_bytes(size, 'big')
+                prev = block
+        else:
+            transform = self._cipher.encrypt_int
+            for i in range(0, len(view), size):
+                prev = transform(int.from_bytes(view[i:i + size], 'big') ^ prev)
+                out[i:i + size] = prev.to_bytes(size, 'big')
+        self._register = prev
+
+    def _process_ctr(self, data: bytes, out: memoryview) -> None:
+        """CTR: XOR с гаммой, неполный последний блок гаммы сохраняется."""
+        view = memoryview(data)
+        size = BLOCK_SIZE
+        pos = min(len(self._keystream), len(view))
+        if pos:
+            out[:pos] = (int.from_bytes(view[:pos], 'big')
+                         ^ int.from_bytes(self._keystream[:pos], 'big')).to_bytes(pos, 'big')
+            self._keystream = self._keystream[pos:]
+
+        transform = self._cipher.encrypt_int
+        counter = self._register
+        full = pos + (len(view) - pos) // size * size
+        for i in range(pos, full, size):
+            out[i:i + size] = (int.from_bytes(view[i:i + size], 'big') ^ transform(counter)).to_bytes(size, 'big')
+            counter = (counter + 1) & COUNTER_MASK
+        tail = len(view) - full
+        if tail:
+            keystream = transform(counter).to_bytes(size, 'big')
+            counter = (counter + 1) & COUNTER_MASK
+            out[full:] = (int.from_bytes(view[full:], 'big')
+                          ^ int.from_bytes(keystream[:tail], 'big')).to_bytes(tail, 'big')
+            self._keystream = keystream[tail:]
+        self._register = counter
+
+    # --- публичный интерфейс ---
+
+    def _split(self, data: bytes) -> tuple:
+        """Для ECB/CBC: (готовые блоки, новый хвост)."""
+        buffer = self._buffer + bytes(data)
+        ready = len(buffer) - len(buffer) % BLOCK_SIZE
+        # При расшифровании с паддингом последний полный блок придерживаем до finalize()
+        if self.decrypt and self.padding and ready == len(buffer):
+            ready -= BLOCK_SIZE
+        ready = max(ready, 0)
+        return buffer[:ready], buffer[ready:]
+
+    def update_into(self, data: bytes, out: Union[bytearray, memoryview]) -> int:
+        """
+        Обрабатывает порцию данных, записывая результат в начало out.
+
+        Буфер out должен вмещать len(data) + 8 байт.
+
+        :return: количество записанных байт
+        :raises ValueError: если finalize() уже был вызван или буфер мал
+        """
+        if self._finalized:
+            raise ValueError("Шифратор уже завершён.")
+        out = memoryview(out)
+        if len(out) < len(data) + BLOCK_SIZE:
+            raise ValueError("Выходной буфер должен вмещать len(data) + 8 байт.")
+        if self.mode == 'CTR':
+            self._process_ctr(data, out[:len(data)])
+            return len(data)
+        ready, self._buffer = self._split(data)
+        self._process_blocks(ready, out[:len(ready)])
+        return len(ready)
+
+    def update(self, data: bytes) -> bytes:
+        """
+        Обрабатывает очередную порцию данных.
+
+        :param data: порция данных произвольной длины
+        :return: готовая часть результата (может быть короче входа)
+        :raises ValueError: если finalize() уже был вызван
+        """
+        out = bytearray(len(data) + BLOCK_SIZE)
+        return bytes(out[:self.update_into(data, out)])
+
+    def finalize(self) -> bytes:
+        """
+        Завершает обработку: добавляет или снимает паддинг и возвращает остаток.
+
+        :return: последняя часть результата
+        :raises ValueError: если длина данных или паддинг некорректны
+        """
+        if self._finalized:
+            raise ValueError("Шифратор уже завершён.")
+        self._finalized = True
+        if self.mode == 'CTR':
+            return b""
+
+        buffer, self._buffer = self._buffer, b""
+        if self.padding and not self.decrypt:
+            buffer = pad(buffer)
+        elif len(buffer) % BLOCK_SIZE != 0:
+            raise ValueError("Длина данных должна быть кратна 8 байтам.")
+        out = bytearray(len(buffer))
+        self._process_blocks(buffer, memoryview(out))
+        return unpad(bytes(out)) if self.padding and self.decrypt else bytes(out)
+
+
+def encryptor(cipher: Cipher, mode: str, iv: Optional[bytes] = None, padding: bool = True) -> StreamingCipher:
+    """Создаёт потоковый шифратор (см. StreamingCipher)."""
+    return StreamingCipher(cipher, mode, iv, decrypt=False, padding=padding)
+
+
+def decryptor(cipher: Cipher, mode: str, iv: Optional[bytes] = None, padding: bool = True) -> StreamingCipher:
+    """Создаёт потоковый дешифратор (см. StreamingCipher)."""
+    return StreamingCipher(cipher, mode, iv, decrypt=True, padding=padding)
+
+
+def process_stream(cipher: StreamingCipher, src: BinaryIO, dst: BinaryIO, buffer_size: int = 1 << 16) -> int:
+    """
+    Пропускает файл через шифратор буфером фиксированного размера.
+
+    Входной и выходной буферы выделяются один раз, поэтому память не зависит
+    от размера файла.
+
+    :return: количество записанных байт
+    """
+    src_buffer = bytearray(buffer_size)
+    out = bytearray(buffer_size + BLOCK_SIZE)
+    view = memoryview(src_buffer)
+    written = 0
+    while n := src.readinto(src_buffer):
+        count = cipher.update_into(view[:n], out)
+        dst.write(memoryview(out)[:count])
+        written += count
+    tail = cipher.finalize()
+    dst.write(tail)
+    return written + len(tail)
+
+
+if __name__ == '__main__':
+    key: bytes = b"ecliptic" + b"secretAd" + b"DanyaMrz"
+    iv: bytes = os.urandom(BLOCK_SIZE)
+    message = 'Съешь же ещё этих мягких французских булок'.encode('utf-8')
+
+    for context in (DES(key[:8]), TripleDES(key[:16]), TripleDES(key)):
+        for example_mode in MODES:
+            enc = encryptor(context, example_mode, iv)
+            ciphertext = enc.update(message[:10]) + enc.update(message[10:]) + enc.finalize()
+            dec = decryptor(context, example_mode, iv)
+            plaintext = dec.update(ciphertext) + dec.finalize()
+            print(f'{type(context).__name__}-{len(context.key) * 8} {example_mode}: '
+                  f'{ciphertext.hex()[:32]}... -> {plaintext.decode("utf-8")}')
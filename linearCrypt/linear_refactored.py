@@ -4,7 +4,7 @@ import math
 import os
 import random
 import string
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 # ======================= Конфигурация =======================
@@ -155,14 +155,15 @@ def prompt_keys(current_a: int, current_b: int, m: int) -> Tuple[int, int]:
             print(f"Ключи некорректны: {e}\nПопробуйте ещё.\n")
 
 
-def random_keys(m: int) -> Tuple[int, int]:
-    """Сгенерировать случайные валидные ключи (a, b)."""
+def random_keys(m: int, rng: Optional[random.Random] = None) -> Tuple[int, int]:
+    """Сгенерировать случайные валидные ключи (a, b); rng — источник случайности (по умолчанию random)."""
+    rng = rng or random
     # случайный 'a' до тех пор, пока взаимно прост
     while True:
-        a = random.randint(1, m - 1)
+        a = rng.randint(1, m - 1)
         if is_coprime(a, m):
             break
-    b = random.randint(0, m - 1)
+    b = rng.randint(0, m - 1)
     return a, b
 
 
@@ -1,13 +1,16 @@
+import random
 from string import ascii_letters, punctuation
-from random import sample
-from typing import Dict
+from typing import Dict, Optional
 
 
-def generate_substitution_key(alphabet: str) -> Dict[str, str]:
+def generate_substitution_key(alphabet: str, rng: Optional[random.Random] = None) -> Dict[str, str]:
     """
     Генерирует случайный ключ (биекцию) для подстановочного шифра.
+
+    rng — источник случайности с интерфейсом random.Random (например,
+    AES/aes_drbg.CtrDRBG); по умолчанию модуль random.
     """
-    shuffled = ''.join(sample(alphabet, len(alphabet)))
+    shuffled = ''.join((rng or random).sample(alphabet, len(alphabet)))
     return dict(zip(alphabet, shuffled))
 
 